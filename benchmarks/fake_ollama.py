@@ -0,0 +1,163 @@
+# standard imports
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# custom imports
+
+# typing imports
+from typing import Any, Dict, List, Optional
+
+
+class FakeOllamaServer:
+    """
+    Local stand-in for the Ollama HTTP API used by the benchmarks.
+
+    Implements `/api/chat`, `/api/generate` (streaming and not) and `/api/tags`.
+    Each request waits `first_token_latency` seconds plus prompt prefill at
+    `prefill_tokens_per_second`, then emits `response_tokens` tokens at
+    `tokens_per_second`. At most `parallel` requests are served at once, like
+    Ollama's OLLAMA_NUM_PARALLEL; the rest queue.
+    """
+
+    def __init__(self,
+                 models: Optional[List[str]] = None,
+                 first_token_latency: float = 0.2,
+                 prefill_tokens_per_second: float = 2000.0,
+                 tokens_per_second: float = 50.0,
+                 response_tokens: int = 200,
+                 parallel: int = 4,
+                 host: str = "127.0.0.1",
+                 port: int = 0):
+        self.models = models or []
+        self.first_token_latency = first_token_latency
+        self.prefill_tokens_per_second = prefill_tokens_per_second
+        self.tokens_per_second = tokens_per_second
+        self.response_tokens = response_tokens
+        self._slots = threading.Semaphore(parallel)
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Start serving in a background thread and return the base URL."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {
+                "requests": self.requests,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
+
+    def response_text(self, request: Dict[str, Any]) -> List[str]:
+        """Tokens of the canned response; override to return structured output."""
+        return [f"token{i} " for i in range(self.response_tokens)]
+
+    def _record(self, prompt_tokens: int, completion_tokens: int):
+        with self._stats_lock:
+            self.requests += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._send_json({"models": [{"name": model, "model": model} for model in server.models]})
+                elif self.path == "/api/version":
+                    self._send_json({"version": "0.0.0-fake"})
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                if self.path not in ("/api/chat", "/api/generate"):
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/api/chat":
+                    prompt = " ".join(message.get("content", "") for message in request.get("messages", []))
+                else:
+                    prompt = request.get("prompt", "")
+                prompt_tokens = len(prompt.split())
+
+                with server._slots:
+                    time.sleep(server.first_token_latency + prompt_tokens / server.prefill_tokens_per_second)
+                    tokens = server.response_text(request)
+                    if request.get("stream", True):
+                        self._stream(request, tokens, prompt_tokens)
+                    else:
+                        time.sleep(len(tokens) / server.tokens_per_second)
+                        self._send_json(self._final_message(request, "".join(tokens), prompt_tokens, len(tokens)))
+                server._record(prompt_tokens, len(tokens))
+
+            def _stream(self, request: Dict[str, Any], tokens: List[str], prompt_tokens: int):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.end_headers()
+                for token in tokens:
+                    time.sleep(1.0 / server.tokens_per_second)
+                    self._write_line(self._message(request, token, done=False))
+                self._write_line(self._final_message(request, "", prompt_tokens, len(tokens)))
+                self.close_connection = True
+
+            def _message(self, request: Dict[str, Any], content: str, done: bool) -> Dict[str, Any]:
+                message = {
+                    "model": request.get("model", ""),
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "done": done,
+                }
+                if self.path == "/api/chat":
+                    message["message"] = {"role": "assistant", "content": content}
+                else:
+                    message["response"] = content
+                return message
+
+            def _final_message(self, request: Dict[str, Any], content: str, prompt_tokens: int, completion_tokens: int) -> Dict[str, Any]:
+                message = self._message(request, content, done=True)
+                message.update({
+                    "done_reason": "stop",
+                    "prompt_eval_count": prompt_tokens,
+                    "prompt_eval_duration": int(prompt_tokens / server.prefill_tokens_per_second * 1e9),
+                    "eval_count": completion_tokens,
+                    "eval_duration": int(completion_tokens / server.tokens_per_second * 1e9),
+                })
+                return message
+
+            def _write_line(self, payload: Dict[str, Any]):
+                self.wfile.write((json.dumps(payload) + "\n").encode("utf-8"))
+                self.wfile.flush()
+
+            def _send_json(self, payload: Dict[str, Any]):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
@@ -0,0 +1,134 @@
+# standard imports
+import random
+import threading
+import time
+import types
+import numpy as np
+
+# custom imports
+
+# typing imports
+from typing import Callable, Optional
+
+
+WORDS = (
+    "python data pipeline distributed systems machine learning stakeholder "
+    "leadership kubernetes analytics experiment latency throughput customer "
+    "architecture mentoring migration reliability product roadmap delivered "
+    "designed improved reduced scaled owned launched collaborated"
+).split()
+
+
+def synthetic_speech(seconds: float, sample_rate: int = 16000, seed: int = 0) -> np.ndarray:
+    """
+    Speech-like float32 audio: bursts of harmonic tones with formant-like
+    modulation separated by short silences, plus a low noise floor.
+    """
+    rng = np.random.default_rng(seed)
+    samples = np.zeros(int(seconds * sample_rate), dtype=np.float32)
+    position = 0
+    while position < samples.shape[0]:
+        burst = int(rng.uniform(0.2, 0.6) * sample_rate)
+        t = np.arange(burst) / sample_rate
+        pitch = rng.uniform(100, 220)
+        tone = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+        envelope = np.sin(np.pi * t / t[-1]) * (0.6 + 0.4 * np.sin(2 * np.pi * rng.uniform(3, 7) * t))
+        end = min(samples.shape[0], position + burst)
+        samples[position:end] = (0.2 * tone * envelope)[:end - position]
+        position = end + int(rng.uniform(0.05, 0.3) * sample_rate)
+    samples += rng.normal(0, 0.002, samples.shape[0]).astype(np.float32)
+    return samples
+
+
+def synthetic_document(pages: int, words_per_page: int = 450, seed: int = 0) -> str:
+    """Resume-like text of roughly `pages` pages."""
+    rng = random.Random(seed)
+    lines = []
+    for page in range(pages):
+        lines.append(f"Experience section {page + 1}")
+        for _ in range(words_per_page // 15):
+            lines.append("- " + " ".join(rng.choice(WORDS) for _ in range(15)) + ".")
+    return "\n".join(lines)
+
+
+def fake_pyaudio_module(audio: np.ndarray, speed: float = 1.0) -> types.ModuleType:
+    """
+    Build a stand-in for the `pyaudio` module whose input streams play `audio`.
+
+    Streams support blocking reads and callback mode. In callback mode a thread
+    delivers `frames_per_buffer` frames at a time, `speed` times faster than real
+    time, followed by silence once the fixture is exhausted. Every `start_stream`
+    plays the audio from the beginning, so a stream reused across recordings
+    replays the same input.
+    """
+    module = types.ModuleType("pyaudio")
+    module.paFloat32 = 1
+    module.paInt16 = 8
+    module.paInputOverflow = 2
+    module.paContinue = 0
+    module.paComplete = 1
+
+    def encode(chunk: np.ndarray, sample_format: int) -> bytes:
+        if sample_format == module.paInt16:
+            return (np.clip(chunk, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+        return chunk.astype(np.float32).tobytes()
+
+    class FakeStream:
+        def __init__(self, format: int, rate: int, frames_per_buffer: int, stream_callback: Optional[Callable] = None, **kwargs):
+            self.format = format
+            self.rate = rate
+            self.frames_per_buffer = frames_per_buffer
+            self.callback = stream_callback
+            self.position = 0
+            self._active = False
+            self._thread: Optional[threading.Thread] = None
+
+        def _next_chunk(self, frames: int) -> np.ndarray:
+            chunk = audio[self.position:self.position + frames]
+            self.position += frames
+            if chunk.shape[0] < frames:
+                chunk = np.concatenate([chunk, np.zeros(frames - chunk.shape[0], dtype=np.float32)])
+            return chunk
+
+        def start_stream(self):
+            self.position = 0
+            self._active = True
+            if self.callback is not None and self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+        def _run(self):
+            interval = self.frames_per_buffer / self.rate / speed
+            while self._active:
+                data = encode(self._next_chunk(self.frames_per_buffer), self.format)
+                self.callback(data, self.frames_per_buffer, None, 0)
+                time.sleep(interval)
+
+        def read(self, frames: int, exception_on_overflow: bool = True) -> bytes:
+            time.sleep(frames / self.rate / speed)
+            return encode(self._next_chunk(frames), self.format)
+
+        def is_active(self) -> bool:
+            return self._active
+
+        def stop_stream(self):
+            self._active = False
+            if self._thread is not None:
+                self._thread.join()
+                self._thread = None
+
+        def close(self):
+            self.stop_stream()
+
+    class PyAudio:
+        def open(self, **kwargs) -> FakeStream:
+            stream = FakeStream(**kwargs)
+            if kwargs.get("start", True):
+                stream.start_stream()
+            return stream
+
+        def terminate(self):
+            pass
+
+    module.PyAudio = PyAudio
+    return module
@@ -0,0 +1,285 @@
+# standard imports
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from loguru import logger
+
+# custom imports
+from benchmarks.fake_ollama import FakeOllamaServer
+from benchmarks.fixtures import fake_pyaudio_module, synthetic_document, synthetic_speech
+
+# typing imports
+from interview_warmup_local.utils import ConfigModel
+from typing import Any, Dict, List, Optional
+
+
+class PeakRSS:
+    """Samples the resident set size while a stage runs and keeps the peak in MiB."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+    def _rss_mb(self) -> float:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * self._page_size / (1024 * 1024)
+        except OSError:
+            # No procfs (macOS): fall back to the process-wide peak, reported in bytes there
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024)
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak_mb = max(self.peak_mb, self._rss_mb())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "PeakRSS":
+        self.peak_mb = self._rss_mb()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = round(max(self.peak_mb, self._rss_mb()), 1)
+
+
+def measure(stage: str, name: str, fn, **extra: Any) -> Dict[str, Any]:
+    """Run one benchmark case, recording wall time and peak RSS, and merge the metrics it returns."""
+    logger.info(f"Running {stage}/{name}")
+    result: Dict[str, Any] = {"stage": stage, "name": name, **extra}
+    try:
+        with PeakRSS() as rss:
+            start = time.perf_counter()
+            metrics = fn() or {}
+            result["wall_seconds"] = round(time.perf_counter() - start, 4)
+        result["peak_rss_mb"] = rss.peak_mb
+        result.update(metrics)
+    except Exception as e:
+        logger.error(f"{stage}/{name} failed: {str(e)}")
+        result["error"] = str(e)
+    return result
+
+
+def bench_stt(config: ConfigModel, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    from interview_warmup_local.audio.audio_io import load_audio
+
+    sample_rate = config.voice_model.sample_rate
+    if args.audio_file:
+        audio = load_audio(args.audio_file, sample_rate)
+    else:
+        audio = synthetic_speech(args.audio_seconds, sample_rate)
+    audio_seconds = audio.shape[0] / sample_rate
+
+    # Replace PyAudio before the capture module is imported
+    sys.modules["pyaudio"] = fake_pyaudio_module(audio, speed=args.audio_speed)
+    from interview_warmup_local.audio.speech_to_text import SpeechToText
+
+    results = []
+    for backend in args.stt_backends:
+        voice_config = config.voice_model.model_copy(update={"model_type": backend})
+        holder: Dict[str, Any] = {}
+
+        def load():
+            holder["stt"] = SpeechToText(voice_config)
+
+        results.append(measure("stt", f"{backend}/load_model", load))
+        if "stt" not in holder:
+            continue
+        stt = holder["stt"]
+
+        def file_transcription():
+            start = time.perf_counter()
+            text = stt.transcribe_samples(audio)
+            elapsed = time.perf_counter() - start
+            return {"audio_seconds": round(audio_seconds, 3), "real_time_factor": round(elapsed / audio_seconds, 4), "words": len(text.split())}
+
+        def live_transcription():
+            start = time.perf_counter()
+            text = stt.transcribe_audio(max_seconds=audio_seconds)
+            elapsed = time.perf_counter() - start
+            return {
+                "audio_seconds": round(audio_seconds, 3),
+                "audio_speed": args.audio_speed,
+                # Time spent beyond what delivering the audio itself takes
+                "processing_lag_seconds": round(elapsed - audio_seconds / args.audio_speed, 4),
+                "words": len(text.split()),
+                "capture_stats": stt.capture_stats,
+            }
+
+        results.append(measure("stt", f"{backend}/file", file_transcription))
+        results.append(measure("stt", f"{backend}/live", live_transcription))
+    return results
+
+
+def bench_index(config: ConfigModel, args: argparse.Namespace, work_dir: Path) -> List[Dict[str, Any]]:
+    from interview_warmup_local.llm.local_llm import InterviewAnalyzer
+
+    results = []
+    job_description_path = work_dir / "job_description.txt"
+    job_description_path.write_text(synthetic_document(1, seed=1))
+    for pages in args.doc_pages:
+        resume_path = work_dir / f"resume_{pages}p.txt"
+        resume_path.write_text(synthetic_document(pages, seed=pages))
+        cache_dir = work_dir / f"index_cache_{pages}p"
+        llm_config = config.llm.model_copy(update={
+            "index_cache_dir": str(cache_dir),
+            "text_cache_dir": None,
+            "response_cache_enabled": False,
+        })
+
+        for name in ("cold", "cached"):
+            analyzer = InterviewAnalyzer(llm_config)
+
+            def create_index():
+                index = analyzer.create_index(str(resume_path), str(job_description_path))
+                return {"nodes": len(index.docstore.docs)}
+
+            result = measure("index", f"{pages}p/{name}", create_index, pages=pages)
+            if "nodes" in result and result["wall_seconds"]:
+                result["nodes_per_second"] = round(result["nodes"] / result["wall_seconds"], 2)
+            results.append(result)
+    return results
+
+
+def bench_llm(config: ConfigModel, args: argparse.Namespace, work_dir: Path) -> List[Dict[str, Any]]:
+    from interview_warmup_local.llm.local_llm import InterviewAnalyzer
+
+    server = FakeOllamaServer(
+        models=[config.llm.model],
+        first_token_latency=args.llm_latency,
+        tokens_per_second=args.llm_tokens_per_second,
+        response_tokens=args.llm_response_tokens,
+        parallel=args.llm_parallel,
+    )
+    base_url = server.start()
+    results = []
+    try:
+        resume_path = work_dir / "llm_resume.txt"
+        resume_path.write_text(synthetic_document(2, seed=7))
+        job_description_path = work_dir / "llm_job_description.txt"
+        job_description_path.write_text(synthetic_document(1, seed=8))
+        questions = [f"Tell me about a time you worked on {word}." for word in (synthetic_document(1).split() * 2)[:args.questions]]
+        answers = [synthetic_document(1, words_per_page=150, seed=i) for i in range(args.questions)]
+        llm_config = config.llm.model_copy(update={
+            "base_url": base_url,
+            "response_cache_enabled": False,
+            "index_cache_dir": str(work_dir / "llm_index_cache"),
+            "text_cache_dir": None,
+        })
+        analyzer = InterviewAnalyzer(llm_config)
+        analyzer.load_documents(str(resume_path), str(job_description_path))
+
+        def analyze_answer():
+            analyzer.analyze_answer(questions[0], answers[0], analyzer.job_description, analyzer.resume)
+
+        def time_to_first_token():
+            start = time.perf_counter()
+            stream = analyzer.stream_analyze_answer(questions[0], answers[0], analyzer.job_description, analyzer.resume)
+            next(stream)
+            first_token = time.perf_counter() - start
+            for _ in stream:
+                pass
+            return {"time_to_first_token_seconds": round(first_token, 4)}
+
+        def process_interview_data():
+            before = server.stats()
+            analyzer.process_interview_data(str(resume_path), str(job_description_path), questions, answers)
+            after = server.stats()
+            return {"completion_tokens": after["completion_tokens"] - before["completion_tokens"]}
+
+        results.append(measure("llm", "analyze_answer", analyze_answer))
+        results.append(measure("llm", "stream_analyze_answer", time_to_first_token))
+        result = measure("llm", "process_interview_data", process_interview_data, questions=args.questions)
+        if "completion_tokens" in result and result["wall_seconds"]:
+            result["questions_per_second"] = round(args.questions / result["wall_seconds"], 3)
+            result["tokens_per_second"] = round(result["completion_tokens"] / result["wall_seconds"], 1)
+        results.append(result)
+    finally:
+        server.stop()
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str):
+    """Log the wall-time change of every case against a previous run."""
+    with open(baseline_path) as f:
+        baseline = {(r["stage"], r["name"]): r for r in json.load(f)["results"]}
+    for result in results:
+        previous = baseline.get((result["stage"], result["name"]))
+        if previous and previous.get("wall_seconds") and result.get("wall_seconds"):
+            change = (result["wall_seconds"] - previous["wall_seconds"]) / previous["wall_seconds"] * 100
+            logger.info(f"{result['stage']}/{result['name']}: {previous['wall_seconds']}s -> {result['wall_seconds']}s ({change:+.1f}%)")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: Optional[List[str]] = None):
+    from interview_warmup_local.utils import read_config
+
+    split = lambda value: [item for item in value.split(",") if item]
+    parser = argparse.ArgumentParser(description="Benchmark the speech-to-text, indexing and analysis stages.")
+    parser.add_argument("--config", default="./config.yaml", help="Path to the config file")
+    parser.add_argument("--stages", type=split, default=["stt", "index", "llm"], help="Comma-separated stages to run")
+    parser.add_argument("--stt-backends", type=split, default=["vosk", "whisper", "faster-whisper"], help="Comma-separated speech backends")
+    parser.add_argument("--audio-file", default=None, help="Recording to use instead of synthetic audio")
+    parser.add_argument("--audio-seconds", type=float, default=20.0, help="Length of the synthetic audio")
+    parser.add_argument("--audio-speed", type=float, default=4.0, help="How many times faster than real time the mocked microphone delivers audio")
+    parser.add_argument("--doc-pages", type=lambda v: [int(p) for p in split(v)], default=[1, 5, 20], help="Comma-separated resume sizes in pages")
+    parser.add_argument("--questions", type=int, default=5, help="Questions per interview in the LLM stage")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Fake Ollama time to first token in seconds")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=50.0, help="Fake Ollama generation rate")
+    parser.add_argument("--llm-response-tokens", type=int, default=200, help="Tokens per fake Ollama response")
+    parser.add_argument("--llm-parallel", type=int, default=4, help="Requests the fake Ollama serves at once")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file for the results")
+    parser.add_argument("--baseline", default=None, help="Previous results file to compare against")
+    args = parser.parse_args(argv)
+
+    config = read_config(args.config)
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        if "stt" in args.stages:
+            results += bench_stt(config, args)
+        if "index" in args.stages:
+            results += bench_index(config, args, work_dir)
+        if "llm" in args.stages:
+            results += bench_llm(config, args, work_dir)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": {key: value for key, value in vars(args).items()},
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Wrote {len(results)} results to {args.output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
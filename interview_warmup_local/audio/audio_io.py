@@ -0,0 +1,98 @@
+# standard imports
+import io
+import wave
+import numpy as np
+from pathlib import Path
+
+# custom imports
+
+# typing imports
+from typing import Tuple, Union
+
+
+RAW_PCM_SUFFIXES = {".pcm", ".raw"}
+
+
+def load_audio(source: Union[str, Path, bytes], sample_rate: int) -> np.ndarray:
+    """
+    Load audio as mono float32 samples in [-1, 1] at the requested sample rate.
+
+    WAV files are read with the standard library and FLAC files with `soundfile`.
+    Files ending in .pcm/.raw, and bytes without a WAV or FLAC header, are treated
+    as raw 16-bit little-endian mono PCM already at `sample_rate`.
+
+    Args:
+        source (Union[str, Path, bytes]): Path to an audio file, or its contents.
+        sample_rate (int): Sample rate expected by the recognizer.
+
+    Returns:
+        np.ndarray: Mono float32 samples.
+
+    Raises:
+        ImportError: If a FLAC input is given and `soundfile` is not installed.
+        ValueError: If the audio format is not supported.
+    """
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if path.suffix.lower() in RAW_PCM_SUFFIXES:
+            return pcm16_to_float32(path.read_bytes())
+        data = path.read_bytes()
+    else:
+        data = bytes(source)
+
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        samples, source_rate = _read_wav(data)
+    elif data[:4] == b"fLaC":
+        samples, source_rate = _read_flac(data)
+    else:
+        return pcm16_to_float32(data)
+
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)
+    return resample(samples.astype(np.float32, copy=False), source_rate, sample_rate)
+
+
+def pcm16_to_float32(data: bytes) -> np.ndarray:
+    """Convert 16-bit little-endian PCM to float32 samples in [-1, 1]."""
+    return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def float32_to_pcm16(samples: np.ndarray) -> bytes:
+    """Convert float32 samples in [-1, 1] to 16-bit little-endian PCM."""
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """Resample with linear interpolation; speech recognizers tolerate its small artifacts."""
+    if source_rate == target_rate or samples.size == 0:
+        return samples
+    target_length = int(round(samples.shape[0] * target_rate / source_rate))
+    positions = np.arange(target_length, dtype=np.float64) * (source_rate / target_rate)
+    return np.interp(positions, np.arange(samples.shape[0]), samples).astype(np.float32)
+
+
+def _read_wav(data: bytes) -> Tuple[np.ndarray, int]:
+    with wave.open(io.BytesIO(data), "rb") as wav:
+        channels = wav.getnchannels()
+        sample_width = wav.getsampwidth()
+        source_rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+
+    if sample_width == 2:
+        samples = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+    elif sample_width == 4:
+        samples = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648.0
+    elif sample_width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {sample_width * 8} bits")
+    return samples.reshape(-1, channels), source_rate
+
+
+def _read_flac(data: bytes) -> Tuple[np.ndarray, int]:
+    try:
+        import soundfile
+    except ImportError:
+        raise ImportError("Reading FLAC files requires the 'soundfile' package: pip install soundfile")
+    samples, source_rate = soundfile.read(io.BytesIO(data), dtype="float32", always_2d=True)
+    return samples, source_rate
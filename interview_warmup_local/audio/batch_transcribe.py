@@ -0,0 +1,118 @@
+# standard imports
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from loguru import logger
+
+# custom imports
+from interview_warmup_local.utils import read_config
+from interview_warmup_local.audio.audio_io import load_audio
+
+# typing imports
+from interview_warmup_local.utils import VoiceModelConfig
+from typing import Any, Dict, Iterator, List, Optional
+
+
+AUDIO_SUFFIXES = {".wav", ".flac", ".pcm", ".raw"}
+
+# Each worker process loads the recognizer once, in `_init_worker`
+_worker_stt = None
+
+
+def _init_worker(voice_model_config: Dict[str, Any], threads_per_worker: int):
+    global _worker_stt
+    from interview_warmup_local.audio.speech_to_text import SpeechToText
+    from interview_warmup_local.scheduler import scheduler
+
+    # A worker transcribes one file at a time
+    scheduler.configure(stt_workers=1)
+
+    # Both Whisper backends size their thread pools from cpu_threads
+    if voice_model_config.get("cpu_threads") is None:
+        voice_model_config = {**voice_model_config, "cpu_threads": threads_per_worker}
+    # Files are transcribed whole, so the live stop phrase detector is not needed
+    _worker_stt = SpeechToText(VoiceModelConfig(**voice_model_config), stop_phrase_detection=False)
+
+
+def _transcribe_one(path: str) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"path": path}
+    try:
+        samples = load_audio(path, _worker_stt.config.sample_rate)
+        start = time.perf_counter()
+        result["text"] = _worker_stt.transcribe_samples(samples)
+        processing_seconds = time.perf_counter() - start
+        audio_seconds = samples.shape[0] / _worker_stt.config.sample_rate
+        result.update({
+            "audio_seconds": round(audio_seconds, 3),
+            "processing_seconds": round(processing_seconds, 3),
+            "real_time_factor": round(processing_seconds / audio_seconds, 4) if audio_seconds else None,
+        })
+    except Exception as e:
+        logger.error(f"Error transcribing {path}: {str(e)}")
+        result["error"] = str(e)
+    return result
+
+
+def find_audio_files(directory: str) -> List[str]:
+    """Return the supported audio files below `directory`, sorted by path."""
+    return sorted(str(p) for p in Path(directory).rglob("*") if p.suffix.lower() in AUDIO_SUFFIXES)
+
+
+def transcribe_files(paths: List[str], voice_model_config: VoiceModelConfig, workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Transcribe audio files across a pool of worker processes.
+
+    Each worker loads the speech model once and then transcribes files one at a
+    time. Unless `cpu_threads` is set, each worker uses an equal share of the CPUs.
+    Results are yielded in the order of `paths`.
+
+    Args:
+        paths (List[str]): Audio files to transcribe.
+        voice_model_config (VoiceModelConfig): Configuration for the voice model.
+        workers (Optional[int]): Number of worker processes. Defaults to the CPU count.
+
+    Yields:
+        Dict[str, Any]: Path, text, audio and processing seconds and real-time factor
+        for each file, or the error that prevented its transcription.
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths) or 1))
+    threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+    # Spawn rather than fork so workers do not inherit the parent's torch thread pools
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker,
+                             initargs=(voice_model_config.model_dump(), threads_per_worker)) as executor:
+        yield from executor.map(_transcribe_one, paths)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Transcribe a directory of recorded answers.")
+    parser.add_argument("directory", help="Directory containing WAV, FLAC or raw 16-bit PCM recordings")
+    parser.add_argument("--config", default="./config.yaml", help="Path to the config file")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--output", default=None, help="JSONL file for the results (default: stdout)")
+    args = parser.parse_args(argv)
+
+    config = read_config(args.config)
+    paths = find_audio_files(args.directory)
+    logger.info(f"Transcribing {len(paths)} files from {args.directory}")
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for result in transcribe_files(paths, config.voice_model, args.workers):
+            if "error" not in result:
+                logger.info(f"{result['path']}: RTF {result['real_time_factor']}")
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
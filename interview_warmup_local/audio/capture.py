@@ -0,0 +1,196 @@
+# standard imports
+import atexit
+import queue
+import threading
+import time
+import numpy as np
+import pyaudio
+from loguru import logger
+
+# custom imports
+from interview_warmup_local.metrics import metrics
+
+# typing imports
+from interview_warmup_local.utils import VoiceModelConfig
+from typing import Dict, List, Optional, Tuple
+
+
+SAMPLE_FORMATS = {
+    np.dtype(np.float32): pyaudio.paFloat32,
+    np.dtype(np.int16): pyaudio.paInt16,
+}
+
+
+class AudioCapture:
+    """
+    Microphone capture decoupled from recognition.
+
+    The PyAudio stream runs in callback mode, so PortAudio delivers audio on its own
+    thread and the callback only pushes raw buffers into a bounded queue. Recognition
+    consumes the queue at its own pace; if it falls behind far enough to fill the
+    queue, the newest buffers are dropped and counted instead of stalling capture.
+
+    The stream is opened on the first `start` and only stopped by `stop`, so later
+    recordings restart it without opening the device again.
+    """
+
+    def __init__(self, voice_model_config: VoiceModelConfig, audio_interface: pyaudio.PyAudio, sample_format: int = pyaudio.paFloat32):
+        self.config = voice_model_config
+        self.audio_interface = audio_interface
+        self.sample_format = sample_format
+        max_chunks = int(voice_model_config.capture_queue_seconds * voice_model_config.sample_rate / voice_model_config.frames_per_buffer)
+        self._queue: "queue.Queue[bytes]" = queue.Queue(maxsize=max(1, max_chunks))
+        self._lock = threading.Lock()
+        self._stream = None
+        self._capturing = False
+        self.captured_frames = 0
+        self.dropped_frames = 0
+        self.overflows = 0
+        self.max_queue_depth = 0
+
+    def start(self):
+        """Start capturing, opening the input stream on first use."""
+        with self._lock:
+            self.captured_frames = 0
+            self.dropped_frames = 0
+            self.overflows = 0
+            self.max_queue_depth = 0
+        # Drop audio left over from the end of the previous recording
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+        if self._stream is None:
+            self._stream = self.audio_interface.open(format=self.sample_format,
+                                                     channels=self.config.channels,
+                                                     rate=self.config.sample_rate,
+                                                     input=True,
+                                                     frames_per_buffer=self.config.frames_per_buffer,
+                                                     stream_callback=self._callback,
+                                                     start=False)
+        self._capturing = True
+        self._stream.start_stream()
+
+    def read(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        Return the next captured buffer, or None if none arrived within `timeout` seconds.
+        """
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stop(self):
+        """Stop capturing; the stream stays open for the next recording."""
+        self._capturing = False
+        if self._stream is not None:
+            self._stream.stop_stream()
+        if self.dropped_frames or self.overflows:
+            logger.warning(f"Audio capture lost data: {self.dropped_frames} frames dropped, {self.overflows} input overflows")
+
+    def close(self):
+        """Stop capturing and close the input stream."""
+        try:
+            self.stop()
+        finally:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for the current or last capture."""
+        with self._lock:
+            return {
+                "captured_frames": self.captured_frames,
+                "dropped_frames": self.dropped_frames,
+                "overflows": self.overflows,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+            }
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        if not self._capturing:
+            return (None, pyaudio.paContinue)
+        with self._lock:
+            self.captured_frames += frame_count
+            if status & pyaudio.paInputOverflow:
+                self.overflows += 1
+            try:
+                self._queue.put_nowait(in_data)
+                self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+            except queue.Full:
+                self.dropped_frames += frame_count
+        return (None, pyaudio.paContinue)
+
+
+class AudioDeviceManager:
+    """
+    Process-wide PyAudio instance and the input streams opened on it.
+
+    Creating a `PyAudio` instance enumerates the audio devices, and opening a stream
+    sets up the device, so both are done once: a finished recording returns its
+    capture, with its stream stopped but open, to be reused by the next recording in
+    the same format. Concurrent recordings each get their own capture.
+    """
+
+    def __init__(self):
+        self._audio_interface: Optional[pyaudio.PyAudio] = None
+        self._idle: Dict[Tuple, List[AudioCapture]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(config: VoiceModelConfig, sample_format: int) -> Tuple:
+        return (sample_format, config.channels, config.sample_rate, config.frames_per_buffer, config.capture_queue_seconds)
+
+    def acquire(self, config: VoiceModelConfig, dtype: np.dtype = np.float32) -> AudioCapture:
+        """
+        Return an idle capture recording samples of `dtype`, creating one if needed.
+
+        Raises:
+            ValueError: If `dtype` is not a supported sample format.
+        """
+        sample_format = SAMPLE_FORMATS.get(np.dtype(dtype))
+        if sample_format is None:
+            raise ValueError(f"Unsupported capture sample format: {np.dtype(dtype)}")
+        key = self._key(config, sample_format)
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+            if self._audio_interface is None:
+                start = time.perf_counter()
+                self._audio_interface = pyaudio.PyAudio()
+                metrics.observe("audio_interface_init_seconds", time.perf_counter() - start)
+            return AudioCapture(config, self._audio_interface, sample_format)
+
+    def release(self, capture: AudioCapture):
+        """
+        Stop a capture and keep it for the next recording.
+
+        A capture whose stream fails to stop is closed instead.
+        """
+        try:
+            capture.stop()
+        except Exception:
+            capture.close()
+            raise
+        with self._lock:
+            self._idle.setdefault(self._key(capture.config, capture.sample_format), []).append(capture)
+
+    def close(self):
+        """Close every idle stream and release the audio devices."""
+        with self._lock:
+            for captures in self._idle.values():
+                for capture in captures:
+                    capture.close()
+            self._idle = {}
+            if self._audio_interface is not None:
+                self._audio_interface.terminate()
+                self._audio_interface = None
+
+
+audio_devices = AudioDeviceManager()
+atexit.register(audio_devices.close)
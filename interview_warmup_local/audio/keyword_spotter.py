@@ -0,0 +1,68 @@
+# standard imports
+import json
+import re
+import numpy as np
+
+# custom imports
+
+# typing imports
+from typing import Any
+
+
+class StopPhraseSpotter:
+    """
+    Incremental search for the stop phrase in a growing transcript.
+
+    Only the newly appended text is scanned, together with a short tail of the
+    previous text so a phrase split across two updates is still found.
+    """
+
+    def __init__(self, stop_phrase: str):
+        self.stop_phrase = self._normalize(stop_phrase)
+        self._pattern = re.compile(rf"\b{re.escape(self.stop_phrase)}\b")
+        self._tail = ""
+
+    def feed(self, text: str) -> bool:
+        """
+        Append transcript text and report whether the stop phrase has now been said.
+        """
+        if not text:
+            return False
+        window = f"{self._tail} {self._normalize(text)}".strip()
+        self._tail = window[-(len(self.stop_phrase) + 1):]
+        return self._pattern.search(window) is not None
+
+    def matches(self, text: str) -> bool:
+        """Check a standalone hypothesis, such as a partial result, for the stop phrase."""
+        return self._pattern.search(self._normalize(text)) is not None
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(re.sub(r"[^\w']+", " ", text.lower()).split())
+
+
+class VoskStopPhraseDetector:
+    """
+    Vosk recognizer dedicated to spotting the stop phrase on partial results.
+
+    The recognizer is restricted to a grammar of just the stop phrase, which small
+    Vosk models decode in a fraction of real time. Models without runtime grammar
+    support fall back to their full vocabulary, and partial results are still
+    checked, so the phrase is caught long before the utterance is finalized.
+    """
+
+    def __init__(self, model: Any, sample_rate: int, stop_phrase: str):
+        from vosk import KaldiRecognizer
+        self.spotter = StopPhraseSpotter(stop_phrase)
+        self.recognizer = KaldiRecognizer(model, sample_rate, json.dumps([self.spotter.stop_phrase, "[unk]"]))
+
+    def accept(self, data: bytes) -> bool:
+        """
+        Feed float32 audio and report whether the stop phrase was heard.
+        """
+        pcm = (np.clip(np.frombuffer(data, dtype=np.float32), -1.0, 1.0) * 32767).astype(np.int16)
+        if self.recognizer.AcceptWaveform(pcm.tobytes()):
+            text = json.loads(self.recognizer.Result()).get('text', "")
+        else:
+            text = json.loads(self.recognizer.PartialResult()).get('partial', "")
+        return self.spotter.matches(text)
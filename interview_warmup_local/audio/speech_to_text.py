@@ -1,129 +1,241 @@
 # standard imports
-import pyaudio
-import json
-import whisper
 import numpy as np
 from loguru import logger
 import re
+import time
+from pathlib import Path
 
 #custom imports
+from interview_warmup_local.model_registry import model_registry
+from interview_warmup_local.metrics import metrics
+from interview_warmup_local.audio.stt_backends import STTBackend, create_backend
+from interview_warmup_local.audio.audio_io import load_audio
+from interview_warmup_local.audio.keyword_spotter import StopPhraseSpotter, VoskStopPhraseDetector
 
 
 # typing imports
 from interview_warmup_local.utils import VoiceModelConfig
-from typing import List
+from typing import Dict, Optional, Union
 
 
 class SpeechToText:
-    def __init__(self, voice_model_config: VoiceModelConfig):
+    def __init__(self, voice_model_config: VoiceModelConfig, session_id: str = "default", stop_phrase_detection: bool = True):
         self.config = voice_model_config
+        # Identifies this session's recognition work to the scheduler
+        self.session_id = session_id
+        # Whether to load the stop phrase model, which only live recordings use
+        self.stop_phrase_detection = stop_phrase_detection
+        self.backend: Optional[STTBackend] = None
         self.model = None
-        self.recognizer = None
+        self.stop_phrase_model = None
+        self.capture_stats: Dict[str, int] = {}
         self.load_model()
 
     def load_model(self):
-        """Load the speech recognition model based on the configuration."""
+        """
+        Load the speech recognition backend selected by `model_type`.
+
+        Models are shared through the process-wide registry, so only the first
+        instance for a given configuration reads the model from disk. Backends without
+        partial results also load the Vosk model set in `stop_phrase_model_path`, if
+        any, to spot the stop phrase, unless `stop_phrase_detection` is off.
+        """
         try:
-            if self.config.model_type.lower() == "vosk":
-                from vosk import Model, KaldiRecognizer
-                self.model = Model(self.config.model_path)
-                self.recognizer = KaldiRecognizer(self.model, self.config.sample_rate)
-            elif self.config.model_type.lower() == "whisper":
-                self.model = whisper.load_model("tiny.en")
-            else:
-                raise ValueError(f"Unsupported model type: {self.config.model_type}")
+            with metrics.span("stt_load_model", backend=self.config.model_type.lower()):
+                self.backend = create_backend(self.config)
+                self.backend.load()
+                self.model = self.backend.model
+                if self.stop_phrase_detection and not self.backend.has_partial_results:
+                    self.stop_phrase_model = self._load_stop_phrase_model()
         except Exception as e:
             logger.error(f"Error loading model: {str(e)}")
             raise
 
-    def transcribe_audio(self) -> str:
+    def _load_stop_phrase_model(self):
+        """
+        Load the Vosk model used to spot the stop phrase while Whisper transcribes.
+
+        Returns None, falling back to searching the Whisper transcript, when
+        `stop_phrase_model_path` is not set or Vosk is not installed.
+        """
+        model_path = self.config.stop_phrase_model_path
+        if not model_path:
+            return None
+        if not Path(model_path).is_dir():
+            logger.warning(f"Stop phrase model {model_path} not found; the stop phrase will be detected from the Whisper transcript")
+            return None
+        try:
+            from vosk import Model
+        except ImportError:
+            logger.warning("Vosk is not installed; the stop phrase will be detected from the Whisper transcript")
+            return None
+        return model_registry.get(("vosk", model_path), lambda: Model(model_path))
+
+    def transcribe_audio(self, max_seconds: Optional[float] = None) -> str:
         """
         Record audio and transcribe it to text when called.
+
+        Audio is captured on PortAudio's callback thread into a bounded queue, so a
+        slow recognizer does not stall capture. It is captured in the backend's
+        `capture_dtype` on a stream kept open between recordings, and each buffer is
+        passed to the recognizer without conversion. Capture counters for the
+        recording are kept in `capture_stats`.
+
+        Args:
+            max_seconds (Optional[float]): Stop after this much audio even if the stop
+                phrase was not said.
         
         Returns:
             str: The recognized text.
         """
         try:
-            p = pyaudio.PyAudio()
-            stream = p.open(format=pyaudio.paFloat32, 
-                            channels=self.config.channels, 
-                            rate=self.config.sample_rate, 
-                            input=True, 
-                            frames_per_buffer=self.config.frames_per_buffer)
+            # PyAudio is only needed for live capture, not for transcribing files
+            from interview_warmup_local.audio.capture import audio_devices
 
+            capture = audio_devices.acquire(self.config, self.backend.capture_dtype)
+            frame_bytes = self.backend.capture_dtype.itemsize * self.config.channels
             recognized_text = ""
-            audio_data: List[np.ndarray] = []
-            
-            logger.info("Listening... Say 'stop now' to stop.")
-            while True:
+            spotter = StopPhraseSpotter(self.config.stop_phrase)
+            stream = self.backend.create_stream(self.session_id)
+            stop_detector = None
+            if self.stop_phrase_model is not None:
+                stop_detector = VoskStopPhraseDetector(self.stop_phrase_model, self.config.sample_rate, self.config.stop_phrase)
+
+            max_frames = int(max_seconds * self.config.sample_rate) if max_seconds is not None else None
+            processed_frames = 0
+
+            with metrics.span("stt_recording", backend=self.config.model_type.lower()) as span:
+                recognition_seconds = 0.0
                 try:
-                    data = stream.read(self.config.chunk_size, exception_on_overflow=False)
-                    if self.config.model_type.lower() == "vosk":
-                        recognized_text += self._process_vosk(data)
-                    else:  # Whisper
-                        recognized_text += self._process_whisper(data, audio_data)
-                    
-                    logger.info(recognized_text)
-                    
-                    # Check for the termination keyword
-                    if "stop now" in recognized_text.lower():
-                        logger.info("Termination keyword detected. Stopping...")
-                        break
-                    
-                except OSError as e:
-                    if e.errno == -9981:  # Input overflowed
-                        logger.warning("Warning: Input overflowed. Continuing...")
-                        continue
-                    else:
-                        logger.error(f"Error during audio processing: {str(e)}")
-                        raise  # Re-raise the exception if it's not an input overflow
-
-            stream.stop_stream()
-            stream.close()
-            p.terminate()
-
-            return re.sub(r'(?i)stop now', '', recognized_text).strip()
+                    capture_start = time.perf_counter()
+                    capture.start()
+                    metrics.observe("stt_capture_start_seconds", time.perf_counter() - capture_start, backend=self.config.model_type.lower())
+                    logger.info(f"Listening... Say '{self.config.stop_phrase}' to stop.")
+                    while True:
+                        if max_frames is not None and processed_frames >= max_frames:
+                            logger.info("Maximum recording length reached. Stopping...")
+                            break
+                        data = capture.read(timeout=1.0)
+                        if data is None:
+                            continue
+                        processed_frames += len(data) // frame_bytes
+                        recognition_start = time.perf_counter()
+
+                        # Spot the stop phrase before running the (slower) main recognizer
+                        if stop_detector is not None and stop_detector.accept(data):
+                            logger.info("Termination keyword detected. Stopping...")
+                            break
+
+                        new_text = stream.accept_buffer(data)
+                        if not new_text and self.backend.has_partial_results and spotter.matches(stream.partial_text()):
+                            logger.info("Termination keyword detected. Stopping...")
+                            break
+
+                        recognition_seconds += time.perf_counter() - recognition_start
+                        if new_text:
+                            recognized_text += new_text
+                            logger.info(recognized_text)
+
+                        # Check the new text for the termination keyword
+                        if spotter.feed(new_text):
+                            logger.info("Termination keyword detected. Stopping...")
+                            break
+                except BaseException:
+                    self.capture_stats = capture.stats()
+                    # The stream may be broken, so it is not kept for the next recording
+                    capture.close()
+                    raise
+                else:
+                    # Read before the capture goes back to the pool, where another session may restart it
+                    self.capture_stats = capture.stats()
+                    audio_devices.release(capture)
+                finally:
+                    logger.debug(f"Capture stats: {self.capture_stats}")
+
+                flush_start = time.perf_counter()
+                recognized_text += stream.finish()
+                recognition_seconds += time.perf_counter() - flush_start
+                span.update(self.capture_stats)
+                self._record_recognition_metrics(recognition_seconds, processed_frames / self.config.sample_rate, self.capture_stats)
+
+            return re.sub(re.escape(self.config.stop_phrase), '', recognized_text, flags=re.IGNORECASE).strip()
         except Exception as e:
             logger.error(f"Error in transcribe_audio: {str(e)}")
             raise
 
-    def _process_vosk(self, data: bytes) -> str:
-        """Process audio data using Vosk model."""
-        try:
-            if self.recognizer.AcceptWaveform(data):
-                result = json.loads(self.recognizer.Result())
-                return result['text'] + " "
-            return ""
-        except Exception as e:
-            logger.error(f"Error in _process_vosk: {str(e)}")
-            return ""
+    def transcribe_file(self, path: Union[str, Path]) -> str:
+        """
+        Transcribe a recorded WAV, FLAC or raw 16-bit PCM file.
 
-    def _process_whisper(self, data: bytes, audio_data: List[np.ndarray]) -> str:
-        """Process audio data using Whisper model."""
+        Args:
+            path (Union[str, Path]): Path to the audio file.
+
+        Returns:
+            str: The recognized text.
+        """
+        return self.transcribe_samples(load_audio(path, self.config.sample_rate))
+
+    def transcribe_bytes(self, data: bytes) -> str:
+        """
+        Transcribe WAV or FLAC file contents, or raw 16-bit mono PCM at the configured sample rate.
+
+        Args:
+            data (bytes): Encoded audio or raw PCM.
+
+        Returns:
+            str: The recognized text.
+        """
+        return self.transcribe_samples(load_audio(data, self.config.sample_rate))
+
+    def transcribe_samples(self, samples: np.ndarray) -> str:
+        """
+        Transcribe mono float32 samples at the configured sample rate.
+
+        Vosk is fed the samples in `chunk_size` pieces, like live audio; Whisper
+        transcribes them in one call with its own 30 s segmentation instead of the
+        overlapping windows of live capture.
+
+        Args:
+            samples (np.ndarray): Audio samples in [-1, 1].
+
+        Returns:
+            str: The recognized text.
+        """
         try:
-            audio_data.append(np.frombuffer(data, dtype=np.float32))
-            if len(audio_data) > 50:  # Process ~3 seconds of audio at a time
-                audio_chunk = np.concatenate(audio_data)
-                result = self.model.transcribe(audio_chunk)
-                audio_data.clear()  # Clear processed audio data
-                return result['text'] + " "
-            return ""
+            recognition_start = time.perf_counter()
+            with metrics.span("stt_transcribe_samples", backend=self.config.model_type.lower()):
+                recognized_text = self.backend.transcribe_recording(samples, self.session_id)
+            self._record_recognition_metrics(time.perf_counter() - recognition_start, samples.shape[0] / self.config.sample_rate)
+            return recognized_text.strip()
         except Exception as e:
-            logger.error(f"Error in _process_whisper: {str(e)}")
-            return ""
+            logger.error(f"Error in transcribe_samples: {str(e)}")
+            raise
+
+    def _record_recognition_metrics(self, recognition_seconds: float, audio_seconds: float, capture_stats: Optional[Dict[str, int]] = None):
+        """Record recognition time and real-time factor, plus capture counters after a live recording."""
+        backend = self.config.model_type.lower()
+        metrics.observe("stt_recognition_seconds", recognition_seconds, backend=backend)
+        metrics.increment("stt_audio_seconds_total", audio_seconds, backend=backend)
+        if audio_seconds > 0:
+            metrics.observe("stt_real_time_factor", recognition_seconds / audio_seconds, backend=backend)
+        if capture_stats:
+            metrics.increment("stt_dropped_frames_total", capture_stats["dropped_frames"], backend=backend)
+            metrics.increment("stt_input_overflows_total", capture_stats["overflows"], backend=backend)
+            metrics.set_gauge("stt_max_queue_depth", capture_stats["max_queue_depth"], backend=backend)
 
-def initialize_speech_to_text(voice_model_config: VoiceModelConfig) -> SpeechToText:
+def initialize_speech_to_text(voice_model_config: VoiceModelConfig, session_id: str = "default") -> SpeechToText:
     """
     Initialize the SpeechToText model.
     
     Args:
         voice_model_config (VoiceModelConfig): Configuration for the voice model.
+        session_id (str): Session the recognition work is scheduled for.
     
     Returns:
         SpeechToText: Initialized SpeechToText object.
     """
     try:
-        return SpeechToText(voice_model_config)
+        return SpeechToText(voice_model_config, session_id)
     except Exception as e:
         logger.error(f"Error initializing SpeechToText: {str(e)}")
         raise
\ No newline at end of file
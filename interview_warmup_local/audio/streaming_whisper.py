@@ -0,0 +1,162 @@
+# standard imports
+import re
+import numpy as np
+from loguru import logger
+
+# custom imports
+
+# typing imports
+from typing import Any, Callable, List
+
+
+class RingBuffer:
+    """Fixed-size FIFO buffer of audio samples backed by a preallocated NumPy array."""
+
+    def __init__(self, capacity: int, dtype: Any = np.float32):
+        self._buffer = np.zeros(capacity, dtype=dtype)
+        self._start = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._buffer.shape[0]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def write(self, samples: np.ndarray):
+        """
+        Append samples, overwriting the oldest ones if the buffer is full.
+        """
+        n = samples.shape[0]
+        if n >= self.capacity:
+            self._buffer[:] = samples[-self.capacity:]
+            self._start = 0
+            self._size = self.capacity
+            return
+
+        overflow = self._size + n - self.capacity
+        if overflow > 0:
+            logger.warning(f"Audio ring buffer full, dropping {overflow} samples")
+            self.consume(overflow)
+
+        end = (self._start + self._size) % self.capacity
+        first = min(n, self.capacity - end)
+        self._buffer[end:end + first] = samples[:first]
+        self._buffer[:n - first] = samples[first:]
+        self._size += n
+
+    def peek(self, n: int, out: np.ndarray) -> np.ndarray:
+        """
+        Copy the oldest `n` samples into `out` without consuming them.
+
+        Returns:
+            np.ndarray: View of `out` holding the samples.
+        """
+        n = min(n, self._size)
+        first = min(n, self.capacity - self._start)
+        out[:first] = self._buffer[self._start:self._start + first]
+        out[first:n] = self._buffer[:n - first]
+        return out[:n]
+
+    def consume(self, n: int):
+        """Discard the oldest `n` samples."""
+        n = min(n, self._size)
+        self._start = (self._start + n) % self.capacity
+        self._size -= n
+
+
+class StreamingWhisperTranscriber:
+    """
+    Incremental Whisper transcription over overlapping fixed-length windows.
+
+    Audio is buffered in a ring buffer and transcribed one window at a time. Consecutive
+    windows overlap so words that straddle a boundary are heard in full, and the words
+    repeated in the overlap are removed from the newer transcript. Windows are
+    treated as silence and never reach the model unless at least `VOICED_FRAMES` of
+    their 30 ms frames have an RMS energy above the threshold, so a short or quiet
+    answer surrounded by silence is still transcribed.
+
+    `transcribe` turns one window of samples into text, so the same windowing serves
+    every Whisper engine.
+    """
+
+    FRAME_SECONDS = 0.03
+    # Frames above the energy threshold that make a window worth transcribing
+    VOICED_FRAMES = 3
+
+    def __init__(self, transcribe: Callable[[np.ndarray], str], sample_rate: int, window_seconds: float, overlap_seconds: float, energy_threshold: float):
+        if not 0 <= overlap_seconds < window_seconds:
+            raise ValueError("window_overlap_seconds must be smaller than window_seconds")
+        self.transcribe = transcribe
+        self.window_samples = int(window_seconds * sample_rate)
+        self.step_samples = self.window_samples - int(overlap_seconds * sample_rate)
+        self.energy_threshold = energy_threshold
+        self.frame_samples = max(1, int(self.FRAME_SECONDS * sample_rate))
+        self._ring = RingBuffer(self.window_samples * 2)
+        self._window = np.zeros(self.window_samples, dtype=np.float32)
+        self._previous_words: List[str] = []
+
+    def accept(self, samples: np.ndarray) -> str:
+        """
+        Add captured samples and transcribe every window that is complete.
+
+        Args:
+            samples (np.ndarray): Mono float32 samples at the configured sample rate.
+
+        Returns:
+            str: Newly transcribed text, or an empty string.
+        """
+        text = ""
+        offset = 0
+        while offset < samples.shape[0]:
+            room = self._ring.capacity - len(self._ring)
+            self._ring.write(samples[offset:offset + room])
+            offset += room
+            while len(self._ring) >= self.window_samples:
+                text += self._transcribe_window(self._ring.peek(self.window_samples, self._window))
+                self._ring.consume(self.step_samples)
+        return text
+
+    def flush(self) -> str:
+        """
+        Transcribe whatever audio is left in the buffer.
+
+        Returns:
+            str: Newly transcribed text, or an empty string.
+        """
+        if len(self._ring) == 0:
+            return ""
+        text = self._transcribe_window(self._ring.peek(len(self._ring), self._window))
+        self._ring.consume(len(self._ring))
+        self._previous_words = []
+        return text
+
+    def _is_silent(self, window: np.ndarray) -> bool:
+        frames = window.size // self.frame_samples
+        if frames == 0:
+            return window.size == 0 or float(np.sqrt(np.mean(np.square(window)))) < self.energy_threshold
+        energy = np.mean(np.square(window[:frames * self.frame_samples].reshape(frames, self.frame_samples)), axis=1)
+        voiced = int(np.count_nonzero(energy >= self.energy_threshold ** 2))
+        return voiced < min(self.VOICED_FRAMES, frames)
+
+    def _transcribe_window(self, window: np.ndarray) -> str:
+        if self._is_silent(window):
+            self._previous_words = []
+            return ""
+
+        words = self.transcribe(window).split()
+        new_words = words[self._overlap_length(self._previous_words, words):]
+        self._previous_words = words
+        return " ".join(new_words) + " " if new_words else ""
+
+    @staticmethod
+    def _overlap_length(previous: List[str], current: List[str]) -> int:
+        """Length of the longest suffix of `previous` that is also a prefix of `current`."""
+        normalize = lambda word: re.sub(r"[^\w']", "", word.lower())
+        previous = [normalize(word) for word in previous]
+        current = [normalize(word) for word in current]
+        for k in range(min(len(previous), len(current)), 0, -1):
+            if previous[-k:] == current[:k]:
+                return k
+        return 0
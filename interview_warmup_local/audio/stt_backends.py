@@ -0,0 +1,330 @@
+# standard imports
+import json
+import threading
+from abc import ABC, abstractmethod
+import numpy as np
+from loguru import logger
+
+# custom imports
+from interview_warmup_local.model_registry import model_registry
+from interview_warmup_local.scheduler import scheduler
+from interview_warmup_local.audio.audio_io import float32_to_pcm16
+from interview_warmup_local.audio.streaming_whisper import StreamingWhisperTranscriber
+
+# typing imports
+from interview_warmup_local.utils import VoiceModelConfig
+from typing import Any, Dict, Hashable, Type
+
+
+_model_locks: Dict[Hashable, threading.Lock] = {}
+_model_locks_guard = threading.Lock()
+
+
+def _model_lock(model_key: Hashable) -> threading.Lock:
+    """Lock serializing the use of a model that is not safe to run concurrently."""
+    with _model_locks_guard:
+        return _model_locks.setdefault(model_key, threading.Lock())
+
+
+class RecognitionStream(ABC):
+    """
+    Recognition state for one recording.
+
+    Samples are fed in as they are captured; `finish` returns the text still held
+    back once the recording ends.
+    """
+
+    @abstractmethod
+    def accept(self, samples: np.ndarray) -> str:
+        """
+        Add mono float32 samples at the configured sample rate.
+
+        Returns:
+            str: Newly recognized text, or an empty string.
+        """
+
+    def accept_buffer(self, data: bytes) -> str:
+        """
+        Add a raw capture buffer in the backend's `capture_dtype`.
+
+        The buffer is viewed as float32 samples without copying it.
+
+        Returns:
+            str: Newly recognized text, or an empty string.
+        """
+        return self.accept(np.frombuffer(data, dtype=np.float32))
+
+    def partial_text(self) -> str:
+        """Current hypothesis for audio not yet returned by `accept`, if the engine has one."""
+        return ""
+
+    @abstractmethod
+    def finish(self) -> str:
+        """
+        Recognize whatever audio is left.
+
+        Returns:
+            str: Newly recognized text, or an empty string.
+        """
+
+
+class STTBackend(ABC):
+    """
+    A speech recognition engine behind `SpeechToText`.
+
+    `load` reads the model through the process-wide model registry; `create_stream`
+    starts the recognition of one recording for a session.
+    """
+
+    # Whether the backend reports partial hypotheses that can be searched for the stop phrase
+    has_partial_results = False
+    # Sample format live audio is captured in for the backend's streams
+    capture_dtype = np.dtype(np.float32)
+
+    def __init__(self, config: VoiceModelConfig):
+        self.config = config
+        self.model = None
+        # Model registry key of the loaded model
+        self.model_key: Hashable = None
+
+    @abstractmethod
+    def load(self):
+        """Load the model, setting `model` and `model_key`."""
+
+    @abstractmethod
+    def create_stream(self, session_id: str = "default") -> RecognitionStream:
+        """Start recognizing a recording of the given session."""
+
+    def transcribe_recording(self, samples: np.ndarray, session_id: str = "default") -> str:
+        """
+        Transcribe a complete recording of mono float32 samples.
+
+        By default the samples are fed through a recognition stream in `chunk_size`
+        pieces, like live audio.
+        """
+        stream = self.create_stream(session_id)
+        text = ""
+        for start in range(0, samples.shape[0], self.config.chunk_size):
+            text += stream.accept(samples[start:start + self.config.chunk_size])
+        return text + stream.finish()
+
+
+class VoskStream(RecognitionStream):
+    def __init__(self, model: Any, sample_rate: int):
+        from vosk import KaldiRecognizer
+        self.recognizer = KaldiRecognizer(model, sample_rate)
+
+    def accept(self, samples: np.ndarray) -> str:
+        return self.accept_buffer(float32_to_pcm16(samples))
+
+    def accept_buffer(self, data: bytes) -> str:
+        """Add 16-bit PCM, which Vosk takes as is."""
+        try:
+            if self.recognizer.AcceptWaveform(data):
+                return json.loads(self.recognizer.Result()).get('text', "") + " "
+            return ""
+        except Exception as e:
+            logger.error(f"Error in VoskStream.accept: {str(e)}")
+            return ""
+
+    def partial_text(self) -> str:
+        try:
+            return json.loads(self.recognizer.PartialResult()).get('partial', "")
+        except Exception as e:
+            logger.error(f"Error in VoskStream.partial_text: {str(e)}")
+            return ""
+
+    def finish(self) -> str:
+        try:
+            return json.loads(self.recognizer.FinalResult()).get('text', "") + " "
+        except Exception as e:
+            logger.error(f"Error in VoskStream.finish: {str(e)}")
+            return ""
+
+
+class VoskBackend(STTBackend):
+    """Kaldi-based Vosk recognizer reading the model directory at `model_path`."""
+
+    has_partial_results = True
+    capture_dtype = np.dtype(np.int16)
+
+    def load(self):
+        from vosk import Model
+        self.model_key = ("vosk", self.config.model_path)
+        self.model = model_registry.get(self.model_key, lambda: Model(self.config.model_path))
+
+    def create_stream(self, session_id: str = "default") -> RecognitionStream:
+        # Vosk keeps its decoding state per stream and is cheap enough to run inline
+        return VoskStream(self.model, self.config.sample_rate)
+
+
+class WhisperStream(RecognitionStream):
+    def __init__(self, transcriber: StreamingWhisperTranscriber):
+        self.transcriber = transcriber
+
+    def accept(self, samples: np.ndarray) -> str:
+        try:
+            return self.transcriber.accept(samples)
+        except Exception as e:
+            logger.error(f"Error in WhisperStream.accept: {str(e)}")
+            return ""
+
+    def finish(self) -> str:
+        return self.transcriber.flush()
+
+
+class WhisperBackendBase(STTBackend):
+    """
+    Shared windowed streaming for the Whisper engines; subclasses transcribe windows.
+
+    Windows are transcribed one per call on the scheduler's STT worker pool for the
+    model, which serves the recordings of concurrent sessions round-robin with up to
+    `SchedulerConfig.stt_workers` windows in flight. Engines whose model cannot run
+    several windows at once set `parallel_windows` to False, and their windows take
+    turns on the model. Every window takes the model from the registry, which loads
+    it again if it was evicted.
+    """
+
+    # Whether windows of concurrent recordings may run on the shared model at the same time
+    parallel_windows = True
+
+    def load(self):
+        self.model_key = self._model_key()
+        self._registry_model()
+
+    @abstractmethod
+    def _model_key(self) -> Hashable:
+        """Model registry key of the configured model."""
+
+    @abstractmethod
+    def _create_model(self) -> Any:
+        """Read the configured model from disk."""
+
+    def _registry_model(self) -> Any:
+        """The model held by the registry for `model_key`, loading it if needed."""
+        self.model = model_registry.get(self.model_key, self._create_model)
+        return self.model
+
+    def _transcribe_on_model(self, samples: np.ndarray) -> str:
+        self._registry_model()
+        if self.parallel_windows:
+            return self.transcribe(samples)
+        with _model_lock(self.model_key):
+            return self.transcribe(samples)
+
+    def _executor(self, session_id: str):
+        return scheduler.executor("stt:" + ":".join(str(part) for part in self.model_key), session_id)
+
+    def create_stream(self, session_id: str = "default") -> RecognitionStream:
+        executor = self._executor(session_id)
+
+        # The transcriber waits for the result before it reuses the window buffer
+        def transcribe(window: np.ndarray) -> str:
+            return executor.submit(self._transcribe_on_model, window).result()
+
+        return WhisperStream(StreamingWhisperTranscriber(
+            transcribe,
+            sample_rate=self.config.sample_rate,
+            window_seconds=self.config.window_seconds,
+            overlap_seconds=self.config.window_overlap_seconds,
+            energy_threshold=self.config.vad_energy_threshold
+        ))
+
+    def transcribe_recording(self, samples: np.ndarray, session_id: str = "default") -> str:
+        """
+        Transcribe a complete recording in one call, split into 30 s segments by the engine.
+
+        Both engines pad their input to 30 s, so the overlapping windows of live
+        capture would pay a full encoder pass for every window step of a file.
+        """
+        return self._executor(session_id).submit(self._transcribe_on_model, samples).result()
+
+    @abstractmethod
+    def transcribe(self, samples: np.ndarray) -> str:
+        """Transcribe float32 samples: a window of a live recording or a whole file."""
+
+
+class WhisperBackend(WhisperBackendBase):
+    """
+    openai-whisper running fp32 PyTorch on the CPU.
+
+    Each decode installs key-value cache hooks on the shared model, so concurrent
+    windows would corrupt each other's cache; they run one at a time instead.
+    """
+
+    parallel_windows = False
+
+    def load(self):
+        import torch
+        if self.config.cpu_threads:
+            torch.set_num_threads(self.config.cpu_threads)
+        super().load()
+
+    def _model_key(self) -> Hashable:
+        return ("whisper", self.config.whisper_model)
+
+    def _create_model(self) -> Any:
+        import whisper
+        return whisper.load_model(self.config.whisper_model, device="cpu")
+
+    def transcribe(self, samples: np.ndarray) -> str:
+        result = self.model.transcribe(
+            samples,
+            fp16=False,
+            language=self.config.language,
+            beam_size=self.config.beam_size if self.config.beam_size > 1 else None,
+            condition_on_previous_text=False
+        )
+        return result['text']
+
+
+class FasterWhisperBackend(WhisperBackendBase):
+    """
+    Whisper on the CTranslate2 engine (faster-whisper), int8-quantized by default.
+
+    `whisper_model` may be a model size such as "base.en" or the path of a converted
+    CTranslate2 model directory. The model gets one CTranslate2 worker per STT
+    scheduler worker, so windows of concurrent recordings are decoded in parallel.
+    """
+
+    def _model_key(self) -> Hashable:
+        return ("faster_whisper", self.config.whisper_model, self.config.compute_type, self.config.cpu_threads, scheduler.stt_workers)
+
+    def _create_model(self) -> Any:
+        from faster_whisper import WhisperModel
+        return WhisperModel(
+            self.config.whisper_model,
+            device="cpu",
+            compute_type=self.config.compute_type,
+            cpu_threads=self.config.cpu_threads or 0,
+            num_workers=scheduler.stt_workers
+        )
+
+    def transcribe(self, samples: np.ndarray) -> str:
+        segments, _ = self.model.transcribe(
+            samples,
+            language=self.config.language,
+            beam_size=self.config.beam_size,
+            condition_on_previous_text=False
+        )
+        return "".join(segment.text for segment in segments)
+
+
+BACKENDS: Dict[str, Type[STTBackend]] = {
+    "vosk": VoskBackend,
+    "whisper": WhisperBackend,
+    "faster-whisper": FasterWhisperBackend,
+}
+
+
+def create_backend(config: VoiceModelConfig) -> STTBackend:
+    """
+    Create the backend selected by `config.model_type`.
+
+    Raises:
+        ValueError: If the model type is not supported.
+    """
+    backend = BACKENDS.get(config.model_type.lower())
+    if backend is None:
+        raise ValueError(f"Unsupported model type: {config.model_type}")
+    return backend(config)
@@ -0,0 +1,217 @@
+# standard imports
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from loguru import logger
+
+# custom imports
+from interview_warmup_local.utils import read_config
+from interview_warmup_local.llm.local_llm import ANALYSIS_FAILED_PREFIX, InterviewAnalyzer
+from interview_warmup_local.llm.response_cache import get_response_cache
+
+# typing imports
+from interview_warmup_local.utils import LLMConfig
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class BatchEvaluator:
+    """
+    Evaluate many recorded interview sessions without the Streamlit UI.
+
+    Sessions that share a resume and job description share one analyzer, so their
+    index is built once. All LLM calls go through one bounded pool, so analyses from
+    different sessions are pipelined while at most `concurrency` requests are in
+    flight. Every finished session is appended to the output JSONL immediately, and
+    sessions already present there are skipped when a run is restarted. A session
+    evaluated again after an error gets a second record; at the end of a run the
+    output is compacted to the last record of each session.
+    """
+
+    def __init__(self, llm_config: LLMConfig, output_path: str, concurrency: Optional[int] = None, work_dir: str = "./data/cache/batch"):
+        self.llm_config = llm_config
+        self.output_path = Path(output_path)
+        self.concurrency = concurrency or llm_config.max_concurrent_requests
+        self.work_dir = Path(work_dir)
+        self._analyzers: Dict[Tuple[str, str], InterviewAnalyzer] = {}
+        self._analyzer_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def completed_sessions(self) -> Set[str]:
+        """
+        IDs of sessions already evaluated successfully in the output file.
+
+        Records with an error, or with a question whose analysis failed, are not
+        complete and are evaluated again.
+        """
+        if not self.output_path.exists():
+            return set()
+        completed = set()
+        with self.output_path.open("r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A line cut short by an interrupted run
+                    continue
+                if "error" in record or any(analysis.startswith(ANALYSIS_FAILED_PREFIX) for analysis in record.get("analyses", [])):
+                    continue
+                completed.add(record["session_id"])
+        return completed
+
+    def run(self, sessions: List[Dict[str, Any]]) -> int:
+        """
+        Evaluate every session not already completed.
+
+        Args:
+            sessions (List[Dict[str, Any]]): Sessions with `session_id`, `resume_path`,
+                `job_description_path` or `job_description`, `questions` and `answers`.
+
+        Returns:
+            int: Number of sessions evaluated in this run.
+        """
+        completed = self.completed_sessions()
+        pending = [session for session in sessions if session["session_id"] not in completed]
+        logger.info(f"{len(completed)} sessions already completed, {len(pending)} to evaluate")
+
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as llm_executor, \
+                ThreadPoolExecutor(max_workers=self.concurrency) as session_executor:
+            futures = [session_executor.submit(self._evaluate_session, session, llm_executor) for session in pending]
+            for future in as_completed(futures):
+                self._write(future.result())
+        if pending:
+            self._compact()
+        return len(pending)
+
+    def _evaluate_session(self, session: Dict[str, Any], llm_executor: ThreadPoolExecutor) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            analyzer = self._get_analyzer(session)
+            # A failed question fails the session, so that a resumed run evaluates it again
+            analyses = analyzer.analyze_answers(session["questions"], session["answers"], executor=llm_executor, raise_errors=True)
+            overall_analysis = llm_executor.submit(analyzer.generate_overall_analysis, analyses).result()
+        except Exception as e:
+            logger.error(f"Error evaluating session {session['session_id']}: {str(e)}")
+            return {"session_id": session["session_id"], "error": str(e)}
+
+        logger.info(f"Evaluated session {session['session_id']}")
+        record = {
+            "session_id": session["session_id"],
+            "questions": session["questions"],
+            "answers": session["answers"],
+            "analyses": analyses,
+            "overall_analysis": overall_analysis,
+            "elapsed_seconds": round(time.perf_counter() - start, 3),
+        }
+        if self.llm_config.structured_output:
+            # Structured analyses are JSON; the aggregated scores make sessions comparable
+            scores = analyzer.overall_scores(analyses)
+            record["scores"] = scores.model_dump() if scores is not None else None
+        return record
+
+    def _get_analyzer(self, session: Dict[str, Any]) -> InterviewAnalyzer:
+        """Return the analyzer for the session's resume and job description, loading it once."""
+        key = (session["resume_path"], self._job_description_path(session))
+        with self._lock:
+            if key in self._analyzers:
+                return self._analyzers[key]
+            key_lock = self._analyzer_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._analyzers:
+                    return self._analyzers[key]
+            analyzer = InterviewAnalyzer(self.llm_config)
+            analyzer.load_documents(*key)
+            with self._lock:
+                self._analyzers[key] = analyzer
+            return analyzer
+
+    def _job_description_path(self, session: Dict[str, Any]) -> str:
+        """Path of the session's job description, writing inline text to a content-addressed file."""
+        if session.get("job_description_path"):
+            return session["job_description_path"]
+        text = session["job_description"]
+        path = self.work_dir / f"job_description_{hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]}.txt"
+        if not path.exists():
+            # Sessions with the same job description must never see a partly written file
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(text)
+            os.replace(tmp_path, path)
+        return str(path)
+
+    def _write(self, record: Dict[str, Any]):
+        with self._write_lock, self.output_path.open("a") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _compact(self):
+        """Rewrite the output with only the last record of each session, dropping cut-off lines."""
+        records: Dict[str, str] = {}
+        with self._write_lock:
+            with self.output_path.open("r") as f:
+                for line in f:
+                    try:
+                        session_id = json.loads(line)["session_id"]
+                    except (ValueError, KeyError):
+                        continue
+                    # Re-inserting moves the session to the position of its latest record
+                    records.pop(session_id, None)
+                    records[session_id] = line if line.endswith("\n") else line + "\n"
+            tmp_path = self.output_path.with_name(f".{self.output_path.name}.tmp")
+            with tmp_path.open("w") as f:
+                f.writelines(records.values())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.output_path)
+
+
+def read_sessions(path: str) -> List[Dict[str, Any]]:
+    """
+    Read sessions from a JSONL file.
+
+    Sessions without a `session_id` are identified by their line number.
+    """
+    sessions = []
+    with open(path, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            session = json.loads(line)
+            session.setdefault("session_id", f"line-{line_number}")
+            if len(session["questions"]) != len(session["answers"]):
+                raise ValueError(f"Session {session['session_id']} has {len(session['questions'])} questions but {len(session['answers'])} answers")
+            sessions.append(session)
+    return sessions
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Evaluate recorded interview sessions from a JSONL file.")
+    parser.add_argument("sessions", help="JSONL file with one session per line")
+    parser.add_argument("--output", required=True, help="JSONL file the results are appended to")
+    parser.add_argument("--config", default="./config.yaml", help="Path to the config file")
+    parser.add_argument("--concurrency", type=int, default=None, help="Maximum LLM requests in flight (default: llm.max_concurrent_requests)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the LLM response cache")
+    args = parser.parse_args(argv)
+
+    config = read_config(args.config)
+    llm_config = config.llm.model_copy(update={"response_cache_enabled": False}) if args.no_cache else config.llm
+    evaluator = BatchEvaluator(llm_config, args.output, concurrency=args.concurrency)
+    evaluated = evaluator.run(read_sessions(args.sessions))
+    logger.info(f"Evaluated {evaluated} sessions, results in {args.output}")
+
+    response_cache = get_response_cache(llm_config)
+    if response_cache is not None:
+        logger.info(f"Response cache: {response_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
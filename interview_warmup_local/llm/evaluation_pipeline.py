@@ -0,0 +1,268 @@
+# standard imports
+import threading
+from concurrent.futures import Executor, Future
+from loguru import logger
+
+# custom imports
+from interview_warmup_local.llm.local_llm import ANALYSIS_FAILED_PREFIX, InterviewAnalyzer
+from interview_warmup_local.metrics import metrics
+from interview_warmup_local.scheduler import scheduler
+
+# typing imports
+from interview_warmup_local.utils import LLMConfig
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class AnalysisJob:
+    """
+    Background analysis of one answer.
+
+    `future` resolves to the analysis text, and `tokens` follows the analysis while
+    it is generated. A cancelled job's future is cancelled right away; if its
+    analysis is already running, it stops at the next token.
+    """
+
+    def __init__(self, question: str, answer: str):
+        self.question = question
+        self.answer = answer
+        self.future: Future = Future()
+        self._task: Optional[Future] = None
+        self._lock = threading.Lock()
+        self._tokens: List[str] = []
+        self._tokens_changed = threading.Condition()
+        self.future.add_done_callback(self._wake_readers)
+
+    def is_current_for(self, question: str, answer: str) -> bool:
+        """Whether the job analyzes this exact answer and has not been cancelled or failed."""
+        if self.question != question or self.answer != answer or self.future.cancelled():
+            return False
+        return not self.future.done() or self.future.exception() is None
+
+    def start(self, executor: Executor, fn: Callable[..., str], *args: Any):
+        with self._lock:
+            if self.future.cancelled():
+                return
+            try:
+                self._task = executor.submit(fn, *args)
+            except Exception as e:
+                self.future.set_exception(e)
+                return
+        self._task.add_done_callback(self._relay)
+
+    def _relay(self, task: Future):
+        with self._lock:
+            if self.future.cancelled() or task.cancelled():
+                return
+            if task.exception() is not None:
+                self.future.set_exception(task.exception())
+            else:
+                self.future.set_result(task.result())
+
+    def cancel(self):
+        with self._lock:
+            self.future.cancel()
+            if self._task is not None:
+                self._task.cancel()
+
+    def add_token(self, token: str):
+        """Publish a token of the analysis to `tokens` readers."""
+        with self._tokens_changed:
+            self._tokens.append(token)
+            self._tokens_changed.notify_all()
+
+    def _wake_readers(self, _: Future):
+        with self._tokens_changed:
+            self._tokens_changed.notify_all()
+
+    def tokens(self) -> Iterator[str]:
+        """
+        Yield the tokens of the analysis, those generated so far at once and the rest as they arrive.
+
+        Raises:
+            Exception: The error the analysis failed with, after the tokens generated before it.
+        """
+        sent = 0
+        while True:
+            with self._tokens_changed:
+                while sent == len(self._tokens) and not self.future.done():
+                    self._tokens_changed.wait()
+                new_tokens = self._tokens[sent:]
+                # Every token is published before the future resolves
+                done = self.future.done()
+            sent += len(new_tokens)
+            yield from new_tokens
+            if done:
+                break
+        self.future.result()
+
+
+class EvaluationPipeline:
+    """
+    Evaluation work of one practice session, run while the session is in progress.
+
+    `prepare` starts parsing the documents, building the index and loading the model
+    on the Ollama server as soon as the inputs are saved. Each answer is then
+    submitted with `submit_answer` when it is recorded or edited, so that by the end
+    of the session most analyses are finished and only have to be collected.
+    """
+
+    def __init__(self, llm_config: LLMConfig, session_id: str):
+        self.llm_config = llm_config
+        self.session_id = session_id
+        self.analyzer = InterviewAnalyzer(llm_config, session_id)
+        self._documents: Optional[Future] = None
+        self._document_paths: Optional[Tuple[str, str]] = None
+        self._jobs: Dict[int, AnalysisJob] = {}
+        self._lock = threading.Lock()
+
+    def prepare(self, resume_path: str, job_description_path: str) -> Future:
+        """
+        Start loading the documents and warming up the model in the background.
+
+        Args:
+            resume_path (str): Path to the resume.
+            job_description_path (str): Path to the job description.
+
+        Returns:
+            Future: Resolves once the documents are loaded and indexed.
+        """
+        self._document_paths = (resume_path, job_description_path)
+        self._documents = scheduler.executor("documents", self.session_id).submit(self._prepare, resume_path, job_description_path)
+        scheduler.executor("llm", self.session_id).submit(self._warm_up)
+        return self._documents
+
+    def _documents_ready(self) -> Future:
+        """The document preparation, started again if it failed."""
+        with self._lock:
+            if self._documents.done() and self._documents.exception() is not None:
+                logger.info("Retrying document preparation")
+                self._documents = scheduler.executor("documents", self.session_id).submit(self._prepare, *self._document_paths)
+            return self._documents
+
+    def _prepare(self, resume_path: str, job_description_path: str):
+        try:
+            with metrics.span("document_preparation"):
+                self.analyzer.load_documents(resume_path, job_description_path)
+        except Exception as e:
+            logger.error(f"Error in EvaluationPipeline._prepare: {str(e)}")
+            raise
+
+    def _warm_up(self):
+        from interview_warmup_local.llm.ollama_llm import preload_ollama_model
+        try:
+            with metrics.span("llm_warm_up"):
+                preload_ollama_model(self.llm_config)
+            logger.info(f"Model {self.llm_config.model} loaded on the Ollama server")
+        except Exception as e:
+            # The first analysis loads the model instead
+            logger.warning(f"Could not warm up model {self.llm_config.model}: {str(e)}")
+
+    def submit_answer(self, position: int, question: str, answer: str) -> Future:
+        """
+        Queue the analysis of an answer, replacing the job of an earlier answer to the question.
+
+        The analysis starts once the documents are loaded. Submitting the same answer
+        again returns the existing job, unless it failed.
+
+        Args:
+            position (int): Index of the question in the practice session.
+            question (str): The question.
+            answer (str): The candidate's answer.
+
+        Returns:
+            Future: Resolves to the analysis text.
+
+        Raises:
+            RuntimeError: If `prepare` has not been called.
+        """
+        return self._submit(position, question, answer).future
+
+    def _submit(self, position: int, question: str, answer: str) -> AnalysisJob:
+        if self._documents is None:
+            raise RuntimeError("EvaluationPipeline.prepare must be called before submitting answers")
+
+        with self._lock:
+            job = self._jobs.get(position)
+            if job is not None and job.is_current_for(question, answer):
+                return job
+            if job is not None:
+                job.cancel()
+                metrics.increment("evaluation_jobs_cancelled_total")
+                logger.debug(f"Cancelled stale analysis of question {position + 1}")
+            job = AnalysisJob(question, answer)
+            self._jobs[position] = job
+
+        executor = scheduler.executor("llm", self.session_id)
+        documents = self._documents_ready()
+        documents.add_done_callback(lambda _: job.start(executor, self._analyze, job, documents, position))
+        return job
+
+    def _analyze(self, job: AnalysisJob, documents: Future, position: int) -> str:
+        logger.debug(f"Analyzing answer to question {position + 1}")
+        try:
+            documents.result()
+            embedding = self.analyzer._embed_retrieval_queries_safe([job.question], [job.answer])[0]
+            tokens = []
+            stream = self.analyzer.stream_analyze_answer(job.question, job.answer, self.analyzer.job_description, self.analyzer.resume, embedding)
+            for token in stream:
+                if job.future.cancelled():
+                    stream.close()
+                    break
+                tokens.append(token)
+                job.add_token(token)
+            return "".join(tokens)
+        except Exception as e:
+            logger.error(f"Error analyzing question {position + 1}: {str(e)}")
+            raise
+
+    def result(self, position: int, question: str, answer: str) -> str:
+        """
+        Wait for the analysis of an answer, submitting it first if it is not current.
+
+        An analysis that failed, e.g. while Ollama was unavailable during the
+        session, is submitted once more before giving up.
+
+        Returns:
+            str: The analysis, or an error message if it failed.
+        """
+        try:
+            return self.submit_answer(position, question, answer).result()
+        except Exception as e:
+            logger.warning(f"Analysis of question {position + 1} failed, retrying: {str(e)}")
+        return self._retry(position, question, answer)
+
+    def stream_result(self, position: int, question: str, answer: str) -> Iterator[str]:
+        """
+        Yield the analysis of an answer as it is generated, submitting it first if it is not current.
+
+        Tokens generated before the call are yielded at once. An analysis that fails
+        is submitted once more, like in `result`, and the new analysis or the error
+        message follows whatever was already yielded.
+
+        Yields:
+            str: Tokens of the analysis.
+        """
+        streamed = False
+        try:
+            for token in self._submit(position, question, answer).tokens():
+                streamed = True
+                yield token
+            return
+        except Exception as e:
+            logger.warning(f"Analysis of question {position + 1} failed, retrying: {str(e)}")
+        analysis = self._retry(position, question, answer)
+        yield f"\n\n{analysis}" if streamed else analysis
+
+    def _retry(self, position: int, question: str, answer: str) -> str:
+        try:
+            return self.submit_answer(position, question, answer).result()
+        except Exception as e:
+            logger.error(f"Error in EvaluationPipeline.result: {str(e)}")
+            return f"{ANALYSIS_FAILED_PREFIX} {str(e)}"
+
+    def cancel(self):
+        """Cancel every pending analysis, e.g. when the session is abandoned."""
+        with self._lock:
+            for job in self._jobs.values():
+                job.cancel()
+            self._jobs = {}
@@ -0,0 +1,160 @@
+# standard imports
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from loguru import logger
+from llama_index.core import StorageContext, load_index_from_storage
+
+# custom imports
+
+# typing imports
+from typing import Dict, Optional, Sequence
+from llama_index.core import VectorStoreIndex
+from llama_index.core.base.embeddings.base import BaseEmbedding
+
+
+_dir_locks: Dict[Path, threading.Lock] = {}
+_dir_locks_guard = threading.Lock()
+
+
+class IndexCache:
+    """
+    On-disk store of persisted vector indexes, keyed by the content of the source
+    documents and the settings used to embed them.
+
+    Entries are evicted least-recently-used first once the total size on disk
+    exceeds `max_bytes`.
+    """
+
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        # Analyzers of concurrent sessions each have their own IndexCache over the same directory
+        with _dir_locks_guard:
+            self._lock = _dir_locks.setdefault(self.cache_dir.resolve(), threading.Lock())
+
+    @staticmethod
+    def make_key(content_hashes: Sequence[str], embed_model: str, chunk_size: int, chunk_overlap: int) -> str:
+        """
+        Build the cache key for a set of source documents and embedding settings.
+
+        Args:
+            content_hashes (Sequence[str]): Hashes of the contents of the documents that make up the index, in order.
+            embed_model (str): Name of the embedding model.
+            chunk_size (int): Chunk size used by the node parser.
+            chunk_overlap (int): Chunk overlap used by the node parser.
+
+        Returns:
+            str: Hex digest identifying the index.
+        """
+        digest = hashlib.sha256()
+        for content_hash in content_hashes:
+            digest.update(content_hash.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(f"{embed_model}|{chunk_size}|{chunk_overlap}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def load(self, key: str, embed_model: Optional[BaseEmbedding] = None) -> Optional[VectorStoreIndex]:
+        """
+        Load a persisted index, or return None if it is not cached.
+
+        The index embeds queries with `embed_model`, or the one configured in
+        llama-index `Settings` if not given. An entry that cannot be read is read
+        again under the directory lock, since a concurrent `save` may have been
+        replacing it, and only removed if it is still unreadable.
+        """
+        entry_dir = self.cache_dir / key
+        if not entry_dir.is_dir():
+            return None
+
+        try:
+            index = self._load_entry(entry_dir, embed_model)
+        except Exception:
+            with self._lock:
+                try:
+                    index = self._load_entry(entry_dir, embed_model)
+                except Exception as e:
+                    logger.warning(f"Discarding unreadable cached index {key}: {str(e)}")
+                    self._remove_entry(key)
+                    return None
+
+        with self._lock:
+            manifest = self._read_manifest()
+            manifest.setdefault(key, {"size": self._dir_size(entry_dir)})
+            manifest[key]["last_used"] = time.time()
+            self._write_manifest(manifest)
+        logger.info(f"Loaded cached index {key}")
+        return index
+
+    def save(self, key: str, index: VectorStoreIndex):
+        """
+        Persist an index under the given key and evict old entries if needed.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry_dir = self.cache_dir / key
+        tmp_dir = self.cache_dir / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            index.storage_context.persist(persist_dir=str(tmp_dir))
+            with self._lock:
+                if entry_dir.exists():
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+                os.replace(tmp_dir, entry_dir)
+                manifest = self._read_manifest()
+                manifest[key] = {"size": self._dir_size(entry_dir), "last_used": time.time()}
+                self._evict(manifest)
+                self._write_manifest(manifest)
+        except Exception as e:
+            logger.error(f"Error persisting index {key}: {str(e)}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        logger.info(f"Persisted index {key}")
+
+    def _evict(self, manifest: Dict[str, Dict[str, float]]):
+        """Drop least-recently-used entries until the cache fits in `max_bytes`."""
+        total = sum(entry["size"] for entry in manifest.values())
+        for key in sorted(manifest, key=lambda k: manifest[k]["last_used"]):
+            if total <= self.max_bytes or len(manifest) <= 1:
+                break
+            total -= manifest.pop(key)["size"]
+            shutil.rmtree(self.cache_dir / key, ignore_errors=True)
+            logger.debug(f"Evicted cached index {key}")
+
+    @staticmethod
+    def _load_entry(entry_dir: Path, embed_model: Optional[BaseEmbedding]) -> VectorStoreIndex:
+        storage_context = StorageContext.from_defaults(persist_dir=str(entry_dir))
+        return load_index_from_storage(storage_context, embed_model=embed_model)
+
+    def _remove_entry(self, key: str):
+        """Delete an entry and its manifest record; the caller holds the lock."""
+        shutil.rmtree(self.cache_dir / key, ignore_errors=True)
+        manifest = self._read_manifest()
+        if manifest.pop(key, None) is not None:
+            self._write_manifest(manifest)
+
+    def _read_manifest(self) -> Dict[str, Dict[str, float]]:
+        manifest_path = self.cache_dir / self.MANIFEST_NAME
+        if not manifest_path.exists():
+            return {}
+        try:
+            with manifest_path.open("r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest: Dict[str, Dict[str, float]]):
+        manifest_path = self.cache_dir / self.MANIFEST_NAME
+        tmp_path = manifest_path.with_suffix(".tmp")
+        with tmp_path.open("w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, manifest_path)
+
+    @staticmethod
+    def _dir_size(path: Path) -> int:
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
@@ -0,0 +1,192 @@
+# standard imports
+import hashlib
+import io
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from xml.etree import ElementTree
+import PyPDF2
+from loguru import logger
+from llama_index.core import Document
+from pydantic import BaseModel, Field
+
+# custom imports
+from interview_warmup_local.metrics import metrics
+
+# typing imports
+from interview_warmup_local.utils import LLMConfig
+from typing import Dict, Optional
+
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class IngestedDocument(BaseModel):
+    file_path: str = Field(..., description="Path the document was read from")
+    content_hash: str = Field(..., description="SHA-256 of the file contents")
+    text: str = Field(..., description="Extracted text")
+
+    def to_document(self) -> Document:
+        """Wrap the extracted text in a llama-index `Document` for indexing."""
+        return Document(
+            text=self.text,
+            metadata={"file_name": Path(self.file_path).name, "file_path": self.file_path},
+            id_=self.content_hash
+        )
+
+
+class DocumentIngestor:
+    """
+    Extracts the text of resumes and job descriptions once per file content.
+
+    PDF, DOCX and plain text files are supported. Extracted text is cached by the
+    SHA-256 of the file contents, in memory and optionally on disk, so the same
+    resume is parsed once no matter how many evaluations use it. Cache files are
+    written atomically, and the least recently used are removed once the directory
+    exceeds `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 64 * 1024 * 1024, max_memory_entries: int = 32):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_bytes = max_bytes
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ingest(self, file_path: str) -> IngestedDocument:
+        """
+        Read a document and return its extracted text.
+
+        Args:
+            file_path (str): Path to a .pdf, .docx or text file.
+
+        Returns:
+            IngestedDocument: The text together with the hash of the file contents.
+        """
+        data = Path(file_path).read_bytes()
+        content_hash = hashlib.sha256(data).hexdigest()
+
+        text = self._cached_text(content_hash)
+        if text is None:
+            metrics.increment("text_cache_misses_total")
+            with metrics.span("text_extraction", suffix=Path(file_path).suffix.lower()):
+                text = extract_text(data, Path(file_path).suffix)
+            self._store_text(content_hash, text)
+            logger.debug(f"Extracted text from {file_path}")
+        else:
+            metrics.increment("text_cache_hits_total")
+        return IngestedDocument(file_path=str(file_path), content_hash=content_hash, text=text)
+
+    def _cached_text(self, content_hash: str) -> Optional[str]:
+        with self._lock:
+            if content_hash in self._memory:
+                self._memory.move_to_end(content_hash)
+                return self._memory[content_hash]
+
+        if self.cache_dir is None:
+            return None
+        cache_file = self.cache_dir / f"{content_hash}.txt"
+        try:
+            text = cache_file.read_text(encoding="utf-8")
+            # The modification time orders files for eviction
+            os.utime(cache_file)
+        except OSError:
+            # Not cached, or evicted by another session in the meantime
+            return None
+        self._remember(content_hash, text)
+        return text
+
+    def _store_text(self, content_hash: str, text: str):
+        self._remember(content_hash, text)
+        if self.cache_dir is None:
+            return
+        tmp_path = self.cache_dir / f".{content_hash}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, self.cache_dir / f"{content_hash}.txt")
+            self._evict()
+        except OSError as e:
+            logger.error(f"Error caching text {content_hash}: {str(e)}")
+            tmp_path.unlink(missing_ok=True)
+
+    def _evict(self):
+        """Remove the least recently used cache files until the directory fits in `max_bytes`."""
+        entries = []
+        for path in self.cache_dir.glob("*.txt"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort(reverse=True)
+
+        total = 0
+        for i, (_, size, path) in enumerate(entries):
+            total += size
+            # The newest file is kept even if it alone exceeds the limit
+            if total > self.max_bytes and i > 0:
+                path.unlink(missing_ok=True)
+                logger.debug(f"Evicted cached text {path.stem}")
+
+    def _remember(self, content_hash: str, text: str):
+        with self._lock:
+            self._memory[content_hash] = text
+            self._memory.move_to_end(content_hash)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+
+def extract_text(data: bytes, suffix: str) -> str:
+    """
+    Extract the text of a document from its contents.
+
+    Args:
+        data (bytes): File contents.
+        suffix (str): File extension, used to pick the parser.
+
+    Returns:
+        str: The extracted text.
+    """
+    suffix = suffix.lower()
+    if suffix == ".pdf":
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+        return "\n".join(page.extract_text() or "" for page in pdf_reader.pages)
+    if suffix == ".docx":
+        return _extract_docx_text(data)
+    return data.decode("utf-8", errors="replace")
+
+
+def _extract_docx_text(data: bytes) -> str:
+    """Read the paragraphs of a .docx body; it is a zip archive around WordprocessingML."""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        root = ElementTree.fromstring(archive.read("word/document.xml"))
+
+    paragraphs = []
+    for paragraph in root.iter(f"{WORD_NAMESPACE}p"):
+        parts = []
+        for element in paragraph.iter():
+            if element.tag == f"{WORD_NAMESPACE}t":
+                parts.append(element.text or "")
+            elif element.tag == f"{WORD_NAMESPACE}tab":
+                parts.append("\t")
+            elif element.tag in (f"{WORD_NAMESPACE}br", f"{WORD_NAMESPACE}cr"):
+                parts.append("\n")
+        paragraphs.append("".join(parts))
+    return "\n".join(paragraphs)
+
+
+_ingestors: Dict[str, DocumentIngestor] = {}
+_ingestors_lock = threading.Lock()
+
+
+def get_document_ingestor(llm_config: LLMConfig) -> DocumentIngestor:
+    """Return the process-wide ingestor for the configured text cache directory."""
+    with _ingestors_lock:
+        ingestor = _ingestors.get(llm_config.text_cache_dir)
+        if ingestor is None:
+            ingestor = DocumentIngestor(llm_config.text_cache_dir, llm_config.text_cache_max_bytes)
+            _ingestors[llm_config.text_cache_dir] = ingestor
+        return ingestor
@@ -0,0 +1,55 @@
+# standard imports
+import threading
+from llama_index.core.instrumentation import get_dispatcher
+from llama_index.core.instrumentation.event_handlers import BaseEventHandler
+from llama_index.core.instrumentation.events.llm import LLMChatEndEvent
+
+# custom imports
+from interview_warmup_local.metrics import metrics
+
+# typing imports
+from typing import Any
+
+
+class LLMTokenMetricsHandler(BaseEventHandler):
+    """
+    Records the token usage Ollama reports with every chat response.
+
+    Completion calls go through chat as well, so handling only the chat end event
+    counts each request once, for both streaming and blocking calls.
+    """
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "LLMTokenMetricsHandler"
+
+    def handle(self, event: Any, **kwargs: Any):
+        if not isinstance(event, LLMChatEndEvent) or event.response is None:
+            return
+        raw = event.response.raw or {}
+        model = raw.get("model", "")
+        prompt_tokens = raw.get("prompt_eval_count")
+        completion_tokens = raw.get("eval_count")
+        if prompt_tokens is not None:
+            metrics.observe("llm_prompt_tokens", prompt_tokens, model=model)
+        if completion_tokens is not None:
+            metrics.observe("llm_completion_tokens", completion_tokens, model=model)
+            metrics.increment("llm_completion_tokens_total", completion_tokens, model=model)
+        # Durations are reported in nanoseconds
+        if completion_tokens and raw.get("eval_duration"):
+            metrics.observe("llm_tokens_per_second", completion_tokens / (raw["eval_duration"] / 1e9), model=model)
+        if prompt_tokens and raw.get("prompt_eval_duration"):
+            metrics.observe("llm_prefill_seconds", raw["prompt_eval_duration"] / 1e9, model=model)
+
+
+_installed = False
+_install_lock = threading.Lock()
+
+
+def install_llm_metrics():
+    """Register the token metrics handler with llama-index once per process."""
+    global _installed
+    with _install_lock:
+        if not _installed:
+            get_dispatcher().add_event_handler(LLMTokenMetricsHandler())
+            _installed = True
@@ -1,124 +1,613 @@
 # standard imports
-import os
-from llama_index.core import ServiceContext
+import functools
+import queue
+import time
+import uuid
+from concurrent.futures import Executor, ThreadPoolExecutor
 from llama_index.core.node_parser import SimpleNodeParser
 from llama_index.core import VectorStoreIndex
-from llama_index.llms.ollama import Ollama
-from llama_index.embeddings.ollama import OllamaEmbedding
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
-from llama_index.core import SimpleDirectoryReader
-from llama_index.core import Settings
 from loguru import logger
-import PyPDF2
 from llama_index.core.prompts import PromptTemplate
+from llama_index.core.schema import MetadataMode, NodeWithScore, QueryBundle
 
 # custom imports
 from interview_warmup_local.utils import LLMConfig
+from interview_warmup_local.llm.index_cache import IndexCache
+from interview_warmup_local.llm.response_cache import get_response_cache
+from interview_warmup_local.llm.ingestion import IngestedDocument, get_document_ingestor
+from interview_warmup_local.model_registry import model_registry
+from interview_warmup_local.metrics import metrics
+from interview_warmup_local.scheduler import scheduler
+from interview_warmup_local.llm.llm_metrics import install_llm_metrics
+from interview_warmup_local.llm.prompt_budget import TokenBudget, compact_analysis
+from interview_warmup_local.llm.structured_scores import aggregate_scores, parse_evaluation, render_overall_scores, summarize_evaluations, validate_evaluation
 
 # typing imports
-from typing import List, Dict
+from interview_warmup_local.utils import AnswerEvaluation, OverallScores
+from typing import List, Dict, Iterator, Optional
+from llama_index.core.base.embeddings.base import BaseEmbedding
+
+
+# Start of the message returned in place of an analysis that failed
+ANALYSIS_FAILED_PREFIX = "Analysis failed for this question:"
+
+
+# The question analysis prompt goes first and the retrieved context last, so that
+# requests share the static instructions and the job description as a prompt prefix
+ANALYSIS_QA_TEMPLATE = PromptTemplate(
+    "{query_str}\n\n"
+    "Relevant excerpts from the resume and job description:\n"
+    "{context_str}\n\n"
+    "Evaluation:\n"
+)
+
+# Appended to the structured analysis prompt when the model's first response was invalid
+STRUCTURED_RETRY_PROMPT = (
+    "\n\nYour previous response could not be used: {error}\n"
+    "Respond again with only the JSON object, in the format given above."
+)
+
+
+def get_embed_model(llm_config: LLMConfig) -> BaseEmbedding:
+    """
+    Return the local embedding model of `llm_config`, loaded once per process through the model registry.
+
+    The query instruction is set explicitly, defaulting to llama-index's choice for
+    the model (e.g. BGE's retrieval instruction), so `embed_queries` can apply the
+    same one.
+    """
+    from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+    from llama_index.embeddings.huggingface.utils import get_query_instruct_tmpl
+
+    query_instruction = llm_config.embed_query_instruction
+    if query_instruction is None:
+        query_instruction = get_query_instruct_tmpl(llm_config.embed_model)
+    return model_registry.get(
+        ("huggingface_embedding", llm_config.embed_model, llm_config.embed_batch_size, query_instruction),
+        lambda: HuggingFaceEmbedding(model_name=llm_config.embed_model, embed_batch_size=llm_config.embed_batch_size, query_instruction=query_instruction)
+    )
+
+
+def embed_queries(llm_config: LLMConfig, queries: List[str]) -> List[List[float]]:
+    """
+    Embed retrieval queries in one batch the way the retriever embeds a single query.
+
+    `get_text_embedding_batch` embeds in text mode, so the model's query instruction
+    is prepended to each query here. The model is taken from the registry on every
+    call, so a batcher calling this never holds on to an evicted model.
+    """
+    embed_model = get_embed_model(llm_config)
+    query_instruction = getattr(embed_model, "query_instruction", None) or ""
+    return embed_model.get_text_embedding_batch([query_instruction + query for query in queries])
 
 
 class InterviewAnalyzer:
-    def __init__(self, llm_config: LLMConfig):
+    def __init__(self, llm_config: LLMConfig, session_id: Optional[str] = None):
         self.llm = None
+        self.json_llm = None
+        self.embed_model = None
         self.index = None
+        self._query_engines = {}
         self.llm_config = llm_config
+        # Identifies this analyzer's work to the scheduler, which serves sessions fairly
+        self.session_id = session_id or uuid.uuid4().hex
+        install_llm_metrics()
+        self.response_cache = get_response_cache(llm_config)
+        self.ingestor = get_document_ingestor(llm_config)
+        self.index_cache = IndexCache(llm_config.index_cache_dir, llm_config.index_cache_max_bytes) if llm_config.index_cache_enabled else None
         self.prompt_templates = {
             'analyze_answer': PromptTemplate(llm_config.prompt_template['question_analysis']),
             'overall_analysis': PromptTemplate(llm_config.prompt_template['overall_analysis'])
         }
+        if llm_config.structured_output:
+            missing = [name for name in ('structured_question_analysis', 'overall_summary') if name not in llm_config.prompt_template]
+            if missing:
+                raise ValueError(f"structured_output needs the prompt templates: {', '.join(missing)}")
+            self.prompt_templates['structured_analysis'] = PromptTemplate(llm_config.prompt_template['structured_question_analysis'])
+            self.prompt_templates['overall_summary'] = PromptTemplate(llm_config.prompt_template['overall_summary'])
 
     def initialize_llm(self):
         """
         Initialize the LLM using Ollama with the configured model.
+
+        The LLM client and the embedding model are taken from the process-wide
+        model registry, so they are only constructed once per configuration. Their
+        packages are imported here, on first use, to keep app start-up fast.
+
+        Both are kept on the analyzer and passed to llama-index explicitly instead of
+        through the global `Settings`, which concurrent sessions would race on.
         """
-        self.llm = Ollama(model=self.llm_config.model, request_timeout=self.llm_config.request_timeout)
-        Settings.llm = self.llm
-        Settings.chunk_size = self.llm_config.chunk_size
-        Settings.chunk_overlap = self.llm_config.chunk_overlap
-        Settings.embed_model = HuggingFaceEmbedding(
-            model_name=self.llm_config.embed_model
-        )
+        from interview_warmup_local.llm.ollama_llm import create_ollama_llm
+
+        llm_key = ("ollama", self.llm_config.base_url, self.llm_config.model, self.llm_config.request_timeout,
+                   self.llm_config.context_window, self.llm_config.keep_alive)
+        self.llm = model_registry.get(llm_key, lambda: create_ollama_llm(self.llm_config))
+        if self.llm_config.structured_output:
+            # Same model, with Ollama constraining the output to JSON
+            self.json_llm = model_registry.get(llm_key + ("json",), lambda: create_ollama_llm(self.llm_config, json_mode=True))
+        self.embed_model = get_embed_model(self.llm_config)
         logger.info("LLM initialized")
         return self.llm
 
-    def create_index(self, resume_path: str, job_description_path: str):
+    def create_index(self, resume_path: str, job_description_path: str, documents: Optional[List[IngestedDocument]] = None):
         """
         Create an index from the resume and job description using local embeddings.
+
+        If the index cache is enabled and an index was already built for the same
+        document contents and embedding settings, it is loaded from disk instead.
+        `documents` can pass in the already ingested resume and job description so
+        they are not parsed again.
         """
         logger.debug(f"Creating index from resume: {resume_path} and job description: {job_description_path}")
-
-        documents = SimpleDirectoryReader(input_files=[resume_path, job_description_path]).load_data()
         self.initialize_llm()
+        if documents is None:
+            documents = [self.ingestor.ingest(resume_path), self.ingestor.ingest(job_description_path)]
 
-        node_parser = SimpleNodeParser.from_defaults()
-        nodes = node_parser.get_nodes_from_documents(documents)
-        self.index = VectorStoreIndex(nodes)
+        cache_key = None
+        if self.index_cache is not None:
+            cache_key = self.index_cache.make_key(
+                [document.content_hash for document in documents],
+                self.llm_config.embed_model,
+                self.llm_config.chunk_size,
+                self.llm_config.chunk_overlap
+            )
+            with metrics.span("index_cache_load"):
+                self.index = self.index_cache.load(cache_key, embed_model=self.embed_model)
+            self._query_engines = {}
+            if self.index is not None:
+                metrics.increment("index_cache_hits_total")
+                return self.index
+            metrics.increment("index_cache_misses_total")
+
+        with metrics.span("index_build") as span:
+            node_parser = SimpleNodeParser.from_defaults(
+                chunk_size=self.llm_config.chunk_size,
+                chunk_overlap=self.llm_config.chunk_overlap
+            )
+            nodes = node_parser.get_nodes_from_documents([document.to_document() for document in documents])
+            self.index = VectorStoreIndex(nodes, embed_model=self.embed_model)
+            span["nodes"] = len(nodes)
+        self._query_engines = {}
         logger.info("Index created")
+
+        if cache_key is not None:
+            self.index_cache.save(cache_key, self.index)
         return self.index
 
-    def analyze_answer(self, question: str, answer: str, job_description: str, resume: str) -> str:
+    def analyze_answer(self, question: str, answer: str, job_description: str, resume: str, query_embedding: Optional[List[float]] = None) -> str:
         """
         Analyze a single question-answer pair.
+
+        Context is retrieved with the question and answer only; `query_embedding` can
+        pass in their precomputed embedding (see `embed_retrieval_queries`).
+
+        With `structured_output`, the analysis is an `AnswerEvaluation` as JSON.
         """
+        if self.llm_config.structured_output:
+            return self.evaluate_answer(question, answer, job_description, query_embedding).model_dump_json()
+
         logger.debug(f"Analyzing answer for question: {question}")
-        prompt = self.prompt_templates['analyze_answer'].format(
-            question=question,
-            answer=answer,
-            job_description=job_description
-        )
+        query_engine = self._query_engine(streaming=False)
+        nodes = self._retrieve(query_engine, question, answer, query_embedding)
+        prompt = self._render_analysis_prompt('analyze_answer', question, answer, job_description, nodes)
+        cache_key = self._response_cache_key(prompt, nodes)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
 
-        query_engine = self.index.as_query_engine()
-        response = query_engine.query(prompt)
+        metrics.observe("llm_prompt_chars", len(prompt), kind="question")
+        with metrics.span("llm_completion", kind="question"):
+            response = str(query_engine.synthesize(QueryBundle(prompt), nodes))
         logger.debug(f"Analysis response: {response}")
-        return str(response)
+        self._cache_response(cache_key, response)
+        return response
 
-    def process_interview_data(self, resume_path: str, job_description_path: str, questions: List[str], answers: List[str]) -> List[str]:
+    def stream_analyze_answer(self, question: str, answer: str, job_description: str, resume: str, query_embedding: Optional[List[float]] = None) -> Iterator[str]:
         """
-        Process the interview data and generate an analysis for each question-answer pair.
+        Analyze a single question-answer pair, yielding the analysis token by token.
+
+        Structured analyses are validated before they are returned, so they are
+        yielded whole.
         """
-        logger.info("Starting interview data processing")
-        # Read job description content
-        with open(job_description_path, 'r') as file:
-            self.job_description = file.read()
+        if self.llm_config.structured_output:
+            yield self.analyze_answer(question, answer, job_description, resume, query_embedding)
+            return
+
+        logger.debug(f"Streaming analysis for question: {question}")
+        query_engine = self._query_engine(streaming=True)
+        nodes = self._retrieve(query_engine, question, answer, query_embedding)
+        prompt = self._render_analysis_prompt('analyze_answer', question, answer, job_description, nodes)
+        cache_key = self._response_cache_key(prompt, nodes)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        metrics.observe("llm_prompt_chars", len(prompt), kind="question")
+        tokens = []
+        with metrics.span("llm_completion", kind="question", streaming=True):
+            start = time.perf_counter()
+            response = query_engine.synthesize(QueryBundle(prompt), nodes)
+            for token in response.response_gen:
+                if not tokens:
+                    metrics.observe("llm_time_to_first_token_seconds", time.perf_counter() - start, kind="question")
+                tokens.append(token)
+                yield token
+        self._cache_response(cache_key, "".join(tokens))
+        logger.debug("Streaming analysis completed")
+
+    def evaluate_answer(self, question: str, answer: str, job_description: str, query_embedding: Optional[List[float]] = None) -> AnswerEvaluation:
+        """
+        Score a single question-answer pair per criterion.
+
+        The model is asked for JSON, which is validated against `AnswerEvaluation`.
+        If the response is not a valid evaluation, the model is asked once more with
+        the validation error appended to the prompt.
+
+        Raises:
+            ValueError: If neither response is a valid evaluation.
+        """
+        logger.debug(f"Evaluating answer for question: {question}")
+        query_engine = self._query_engine(streaming=False, structured=True)
+        nodes = self._retrieve(query_engine, question, answer, query_embedding)
+        prompt = self._render_analysis_prompt('structured_analysis', question, answer, job_description, nodes)
+        cache_key = self._response_cache_key(prompt, nodes)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return validate_evaluation(cached)
+
+        request = prompt
+        for attempt in range(2):
+            metrics.observe("llm_prompt_chars", len(request), kind="question")
+            with metrics.span("llm_completion", kind="question", structured=True):
+                response = str(query_engine.synthesize(QueryBundle(request), nodes))
+            logger.debug(f"Evaluation response: {response}")
+            try:
+                evaluation = validate_evaluation(response)
+                break
+            except ValueError as e:
+                metrics.increment("structured_output_invalid_total")
+                if attempt:
+                    raise
+                logger.warning(f"Invalid evaluation, asking again: {str(e)}")
+                request = prompt + STRUCTURED_RETRY_PROMPT.format(error=str(e))
+        self._cache_response(cache_key, evaluation.model_dump_json())
+        return evaluation
+
+    def embed_retrieval_queries(self, questions: List[str], answers: List[str]) -> List[List[float]]:
+        """
+        Embed the retrieval query of every question-answer pair in batched calls.
+
+        The queries are embedded in query mode, like the retriever embeds a query,
+        so retrieval does not depend on whether a precomputed embedding was passed.
+
+        Queries go through the scheduler's embedding micro-batcher, so queries from
+        concurrent sessions share batches of up to `LLMConfig.embed_batch_size`.
+        """
+        queries = [self._retrieval_query(question, answer) for question, answer in zip(questions, answers)]
+        if not queries:
+            return []
+        batcher = scheduler.batcher(
+            f"embedding:query:{self.llm_config.embed_model}:{self.llm_config.embed_batch_size}",
+            functools.partial(embed_queries, self.llm_config),
+            max_batch_size=self.llm_config.embed_batch_size
+        )
+        metrics.observe("query_embedding_batch_size", len(queries))
+        with metrics.span("query_embedding"):
+            futures = [batcher.submit(self.session_id, query) for query in queries]
+            return [future.result() for future in futures]
+
+    def _query_engine(self, streaming: bool, structured: bool = False):
+        """Return the query engine for the current index, building it once per index."""
+        query_engine = self._query_engines.get((streaming, structured))
+        if query_engine is None:
+            llm = self.json_llm if structured else self.llm
+            query_engine = self.index.as_query_engine(llm=llm, streaming=streaming, text_qa_template=ANALYSIS_QA_TEMPLATE)
+            self._query_engines[(streaming, structured)] = query_engine
+        return query_engine
+
+    def _retrieve(self, query_engine, question: str, answer: str, query_embedding: Optional[List[float]]) -> List[NodeWithScore]:
+        query_bundle = QueryBundle(self._retrieval_query(question, answer), embedding=query_embedding)
+        with metrics.span("retrieval") as span:
+            nodes = query_engine.retrieve(query_bundle)
+            span["nodes"] = len(nodes)
+        return nodes
+
+    @staticmethod
+    def _retrieval_query(question: str, answer: str) -> str:
+        return f"{question}\n{answer}"
+
+    def _render_analysis_prompt(self, template_name: str, question: str, answer: str, job_description: str, nodes: List[NodeWithScore]) -> str:
+        """
+        Fill a question analysis template, shortening the job description and the
+        answer if the prompt and the retrieved context would not fit the context window.
+        """
+        context = "\n\n".join(node.get_content(metadata_mode=MetadataMode.LLM) for node in nodes)
+        budget = self._token_budget()
+        budget.used_tokens += budget.count(ANALYSIS_QA_TEMPLATE.format(query_str="", context_str=context))
+        template = self.prompt_templates[template_name]
+        parts = budget.fit(
+            template.get_template(),
+            {"question": question, "answer": answer, "job_description": job_description},
+            keep=["question"]
+        )
+        return template.format(**parts)
+
+    def _token_budget(self) -> TokenBudget:
+        return TokenBudget(self.llm_config.context_window, self.llm_config.response_token_reserve, margin=self.llm_config.prompt_budget_margin)
+
+    def load_documents(self, resume_path: str, job_description_path: str):
+        """
+        Read the resume and job description and build the index over them.
+
+        Each document is parsed once; the same extracted text feeds both the prompts
+        and the index.
+        """
+        with metrics.span("document_parse", document="job_description"):
+            job_description = self.ingestor.ingest(job_description_path)
+        self.job_description = job_description.text
         logger.debug("Job description loaded")
 
-        # Read resume content (PDF)
-        with open(resume_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            self.resume = ""
-            for page in pdf_reader.pages:
-                self.resume += page.extract_text()
+        with metrics.span("document_parse", document="resume"):
+            resume = self.ingestor.ingest(resume_path)
+        self.resume = resume.text
         logger.debug("Resume loaded")
 
         # Create index using settings
-        _ = self.create_index(resume_path, job_description_path)
+        _ = self.create_index(resume_path, job_description_path, documents=[resume, job_description])
 
-        analyses = []
-        for i, (question, answer) in enumerate(zip(questions, answers), 1):
-            logger.debug(f"Processing question {i} of {len(questions)}")
-            analysis = self.analyze_answer(question, answer, self.job_description, self.resume)
-            analyses.append(analysis)
+    def process_interview_data(self, resume_path: str, job_description_path: str, questions: List[str], answers: List[str], max_workers: Optional[int] = None) -> List[str]:
+        """
+        Process the interview data and generate an analysis for each question-answer pair.
 
+        Question-answer pairs are analyzed concurrently, on a private pool of
+        `max_workers` threads if given, otherwise on the scheduler's shared LLM pool
+        of `SchedulerConfig.llm_workers`. Analyses are returned in question order; a
+        question whose analysis fails gets an error message instead of stopping the
+        others.
+        """
+        logger.info("Starting interview data processing")
+        self.load_documents(resume_path, job_description_path)
+
+        analyses = self.analyze_answers(questions, answers, max_workers=max_workers)
+
+        if self.response_cache is not None:
+            logger.info(f"Response cache: {self.response_cache.stats()}")
         logger.info("Interview data processing completed")
         return analyses
 
+    def analyze_answers(self, questions: List[str], answers: List[str], max_workers: Optional[int] = None, executor: Optional[Executor] = None, raise_errors: bool = False) -> List[str]:
+        """
+        Analyze question-answer pairs concurrently against the loaded documents.
+
+        By default the analyses run on the scheduler's shared LLM worker pool, which
+        bounds the requests in flight across all sessions.
+
+        Args:
+            questions (List[str]): Interview questions.
+            answers (List[str]): The candidate's answers, in question order.
+            max_workers (Optional[int]): Size of a private thread pool to use instead of the scheduler.
+            executor (Optional[Executor]): Executor to submit the analyses to instead of the scheduler.
+            raise_errors (bool): Raise the first failed analysis instead of returning an error message for it.
+
+        Returns:
+            List[str]: One analysis per pair, in question order.
+        """
+        pairs = list(zip(questions, answers))
+        if executor is None and max_workers is not None:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pairs) or 1))) as own_executor:
+                return self.analyze_answers(questions, answers, executor=own_executor, raise_errors=raise_errors)
+        executor = executor or scheduler.executor("llm", self.session_id)
+
+        embeddings = self._embed_retrieval_queries_safe(questions, answers)
+        if raise_errors:
+            futures = [
+                executor.submit(self.analyze_answer, question, answer, self.job_description, self.resume, embedding)
+                for (question, answer), embedding in zip(pairs, embeddings)
+            ]
+        else:
+            futures = [
+                executor.submit(self._analyze_answer_safe, i, len(pairs), question, answer, embedding)
+                for i, ((question, answer), embedding) in enumerate(zip(pairs, embeddings), 1)
+            ]
+        return [future.result() for future in futures]
+
+    def _embed_retrieval_queries_safe(self, questions: List[str], answers: List[str]) -> List[Optional[List[float]]]:
+        """Batch-embed the retrieval queries, falling back to embedding them one by one on failure."""
+        try:
+            return self.embed_retrieval_queries(questions, answers)
+        except Exception as e:
+            logger.warning(f"Batch query embedding failed, embedding per question: {str(e)}")
+            return [None] * len(questions)
+
+    def _analyze_answer_safe(self, position: int, total: int, question: str, answer: str, query_embedding: Optional[List[float]] = None) -> str:
+        """Analyze one question-answer pair, turning a failure into an error message."""
+        logger.debug(f"Processing question {position} of {total}")
+        try:
+            return self.analyze_answer(question, answer, self.job_description, self.resume, query_embedding)
+        except Exception as e:
+            logger.error(f"Error analyzing question {position}: {str(e)}")
+            return f"{ANALYSIS_FAILED_PREFIX} {str(e)}"
+
+    def stream_in_background(self, stream: Iterator[str], description: str, executor: Optional[Executor] = None) -> Iterator[str]:
+        """
+        Run a token stream on a worker and return an iterator over its tokens.
+
+        Args:
+            stream (Iterator[str]): Token stream, e.g. from `stream_overall_analysis`.
+            description (str): What is being analyzed, for error messages.
+            executor (Optional[Executor]): Where to run the stream; defaults to the
+                scheduler's LLM worker pool.
+
+        Returns:
+            Iterator[str]: The tokens, buffered until they are consumed.
+        """
+        channel = queue.Queue()
+        (executor or scheduler.executor("llm", self.session_id)).submit(self._pump_stream, description, channel, stream)
+        return self._drain_stream(channel)
+
+    @staticmethod
+    def _pump_stream(description: str, channel: queue.Queue, stream: Iterator[str]):
+        """Feed the tokens of `stream` into `channel`, ending with None."""
+        try:
+            for token in stream:
+                channel.put(token)
+        except Exception as e:
+            logger.error(f"Error streaming analysis for {description}: {str(e)}")
+            channel.put(f"\n\nAnalysis failed for {description}: {str(e)}")
+        finally:
+            channel.put(None)
+
+    @staticmethod
+    def _drain_stream(channel: queue.Queue) -> Iterator[str]:
+        while True:
+            token = channel.get()
+            if token is None:
+                return
+            yield token
+
     def generate_overall_analysis(self, analyses: List[str]) -> str:
         """
         Generate an overall analysis based on individual question-answer analyses.
+
+        With `structured_output`, the overall scores are computed from the answer
+        scores and the LLM only writes a short summary.
         """
+        if self.llm_config.structured_output:
+            return "".join(self.stream_overall_analysis(analyses))
+
         logger.info("Generating overall analysis")
-        prompt = self.prompt_templates['overall_analysis'].format(
-            analyses=' '.join(analyses),
-            resume=self.resume,
-            job_description=self.job_description
-        )
-        response = self.llm.complete(prompt)
+        prompt = self._render_overall_prompt(analyses)
+        cache_key = self._response_cache_key(prompt)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+        metrics.observe("llm_prompt_chars", len(prompt), kind="overall")
+        with metrics.span("llm_completion", kind="overall"):
+            response = str(self.llm.complete(prompt))
         logger.debug(f"Overall analysis response: {response}")
+        self._cache_response(cache_key, response)
 
         logger.info("Overall analysis generation completed")
-        return str(response)
+        return response
+
+    def stream_overall_analysis(self, analyses: List[str]) -> Iterator[str]:
+        """
+        Generate the overall analysis, yielding it token by token.
+
+        With `structured_output`, the overall scores are yielded first, followed by
+        the streamed summary.
+        """
+        if self.llm_config.structured_output:
+            yield from self._stream_structured_overall_analysis(analyses)
+            return
+
+        logger.info("Streaming overall analysis")
+        prompt = self._render_overall_prompt(analyses)
+        cache_key = self._response_cache_key(prompt)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        metrics.observe("llm_prompt_chars", len(prompt), kind="overall")
+        tokens = []
+        with metrics.span("llm_completion", kind="overall", streaming=True):
+            start = time.perf_counter()
+            for chunk in self.llm.stream_complete(prompt):
+                if chunk.delta:
+                    if not tokens:
+                        metrics.observe("llm_time_to_first_token_seconds", time.perf_counter() - start, kind="overall")
+                    tokens.append(chunk.delta)
+                    yield chunk.delta
+        self._cache_response(cache_key, "".join(tokens))
+
+        logger.info("Overall analysis generation completed")
+
+    def overall_scores(self, analyses: List[str]) -> Optional[OverallScores]:
+        """
+        Aggregate the scores of the structured analyses among `analyses`.
+
+        Analyses that are not structured, such as error messages, are skipped.
+
+        Returns:
+            Optional[OverallScores]: The overall scores, or None if no analysis has scores.
+        """
+        evaluations = [evaluation for evaluation in map(parse_evaluation, analyses) if evaluation is not None]
+        return aggregate_scores(evaluations) if evaluations else None
+
+    def _stream_structured_overall_analysis(self, analyses: List[str]) -> Iterator[str]:
+        evaluations = [evaluation for evaluation in map(parse_evaluation, analyses) if evaluation is not None]
+        if not evaluations:
+            yield "None of the answers could be scored."
+            return
+        scores = aggregate_scores(evaluations)
+        scores_text = render_overall_scores(scores)
+        yield scores_text + "\n\n**Overall Summary**:\n"
+
+        logger.info("Streaming overall summary")
+        template = self.prompt_templates['overall_summary']
+        parts = self._token_budget().fit(
+            template.get_template(),
+            {"scores": scores_text, "evaluations": summarize_evaluations(evaluations), "job_description": self.job_description},
+            keep=["scores"]
+        )
+        prompt = template.format(**parts)
+        cache_key = self._response_cache_key(prompt)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        metrics.observe("llm_prompt_chars", len(prompt), kind="summary")
+        tokens = []
+        with metrics.span("llm_completion", kind="summary", streaming=True):
+            start = time.perf_counter()
+            for chunk in self.llm.stream_complete(prompt):
+                if chunk.delta:
+                    if not tokens:
+                        metrics.observe("llm_time_to_first_token_seconds", time.perf_counter() - start, kind="summary")
+                    tokens.append(chunk.delta)
+                    yield chunk.delta
+        self._cache_response(cache_key, "".join(tokens))
+
+    def _render_overall_prompt(self, analyses: List[str]) -> str:
+        """
+        Fill the overall analysis template.
+
+        Each analysis is reduced to its scores and key points, and the resume and job
+        description are shortened if the prompt would not fit the context window.
+        """
+        compact = "\n\n".join(f"Question {i}:\n{compact_analysis(analysis)}" for i, analysis in enumerate(analyses, start=1))
+        template = self.prompt_templates['overall_analysis']
+        parts = self._token_budget().fit(
+            template.get_template(),
+            {"analyses": compact, "resume": self.resume, "job_description": self.job_description}
+        )
+        return template.format(**parts)
+
+    def _response_cache_key(self, prompt: str, nodes: Optional[List[NodeWithScore]] = None) -> Optional[str]:
+        """Key a response on the model, the rendered prompt and the retrieved context."""
+        if self.response_cache is None:
+            return None
+        context = "\n".join(node.node.get_content() for node in nodes or [])
+        return self.response_cache.make_key(self.llm_config.model, prompt, context)
+
+    def _cached_response(self, cache_key: Optional[str]) -> Optional[str]:
+        if cache_key is None:
+            return None
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            metrics.increment("response_cache_hits_total")
+            logger.debug("Response served from cache")
+        else:
+            metrics.increment("response_cache_misses_total")
+        return cached
+
+    def _cache_response(self, cache_key: Optional[str], response: str):
+        if cache_key is not None:
+            self.response_cache.put(cache_key, response)
 
     def set_prompt_template(self, template_name: str, new_template: str):
         """
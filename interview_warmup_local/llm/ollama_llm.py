@@ -0,0 +1,77 @@
+# standard imports
+from ollama import AsyncClient, Client
+from llama_index.llms.ollama import Ollama
+
+# custom imports
+
+# typing imports
+from interview_warmup_local.utils import LLMConfig
+from typing import Any, Optional, Union
+
+
+class KeepAliveClient(Client):
+    """
+    Ollama client that sends `keep_alive` with every chat request.
+
+    llama-index's Ollama LLM does not pass `keep_alive`, so without it every request
+    resets the server's unload timer to its default. Keeping the model loaded also
+    keeps its KV cache, letting requests that share a prompt prefix skip re-prefill.
+    """
+
+    def __init__(self, host: str, timeout: float, keep_alive: Optional[Union[float, str]]):
+        super().__init__(host=host, timeout=timeout)
+        self.keep_alive = keep_alive
+
+    def chat(self, *args: Any, **kwargs: Any):
+        if kwargs.get("keep_alive") is None:
+            kwargs["keep_alive"] = self.keep_alive
+        return super().chat(*args, **kwargs)
+
+
+class AsyncKeepAliveClient(AsyncClient):
+    """Async counterpart of `KeepAliveClient`."""
+
+    def __init__(self, host: str, timeout: float, keep_alive: Optional[Union[float, str]]):
+        super().__init__(host=host, timeout=timeout)
+        self.keep_alive = keep_alive
+
+    async def chat(self, *args: Any, **kwargs: Any):
+        if kwargs.get("keep_alive") is None:
+            kwargs["keep_alive"] = self.keep_alive
+        return await super().chat(*args, **kwargs)
+
+
+def create_ollama_llm(llm_config: LLMConfig, json_mode: bool = False) -> Ollama:
+    """
+    Create the Ollama LLM for `llm_config`.
+
+    `context_window` is sent as Ollama's `num_ctx`, so the server allocates the same
+    context the prompts are budgeted for, and `keep_alive` keeps the model loaded.
+    With `json_mode`, Ollama constrains the output to valid JSON.
+    """
+    return Ollama(
+        model=llm_config.model,
+        base_url=llm_config.base_url,
+        request_timeout=llm_config.request_timeout,
+        context_window=llm_config.context_window,
+        json_mode=json_mode,
+        client=KeepAliveClient(llm_config.base_url, llm_config.request_timeout, llm_config.keep_alive),
+        async_client=AsyncKeepAliveClient(llm_config.base_url, llm_config.request_timeout, llm_config.keep_alive)
+    )
+
+
+def preload_ollama_model(llm_config: LLMConfig):
+    """
+    Load the model on the Ollama server ahead of the first request.
+
+    Ollama loads the model without generating anything for an empty prompt. It is
+    loaded with the `num_ctx` of `create_ollama_llm`, since requesting another context
+    size would make the server load it again.
+    """
+    client = KeepAliveClient(llm_config.base_url, llm_config.request_timeout, llm_config.keep_alive)
+    client.generate(
+        model=llm_config.model,
+        prompt="",
+        options={"num_ctx": llm_config.context_window},
+        keep_alive=llm_config.keep_alive
+    )
@@ -0,0 +1,123 @@
+# standard imports
+import re
+from llama_index.core import Settings
+
+# custom imports
+
+# typing imports
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+TRUNCATION_MARKER = " [...]"
+
+_SCORE_LINE = re.compile(r"^[\s\-*]*\**\s*([A-Za-z][A-Za-z &/]*?)\s*\**\s*:\s*\**\s*\[?(\d(?:\.\d)?)\]?\s*(?:/\s*5)?\**\s*$")
+_BULLET_LINE = re.compile(r"^\s*[-*]\s+(.*\S)\s*$")
+_SECTION_LINE = re.compile(r"^\s*\*\*[^*]+\*\*\s*:?\s*$")
+_WORDS = re.compile(r"\S+\s*")
+
+
+class TokenBudget:
+    """
+    Fits prompt inputs into the model's context window.
+
+    Tokens are counted with the llama-index tokenizer (`Settings.tokenizer`), which
+    only approximates the local model's own tokenizer: Llama and Mistral tokenizers
+    produce up to a quarter more tokens for English text. Counted tokens therefore
+    only fill the `margin` fraction of the context window left after
+    `reserved_tokens`, the room for the response.
+    """
+
+    def __init__(self, context_window: int, reserved_tokens: int = 0, tokenizer: Optional[Callable[[str], List]] = None, margin: float = 1.0):
+        self.context_window = context_window
+        self.reserved_tokens = reserved_tokens
+        self.tokenizer = tokenizer or Settings.tokenizer
+        self.margin = margin
+        # Counted tokens of text sent along with the fitted prompt, e.g. retrieved context
+        self.used_tokens = 0
+
+    @property
+    def available(self) -> int:
+        return max(0, int(max(0, self.context_window - self.reserved_tokens) * self.margin) - self.used_tokens)
+
+    def count(self, text: str) -> int:
+        return len(self.tokenizer(text))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut `text` at a word boundary so that it fits in `max_tokens`."""
+        tokens = self.count(text)
+        if tokens <= max_tokens:
+            return text
+        words = _WORDS.findall(text)
+        keep = int(len(words) * max_tokens / tokens)
+        while keep > 0:
+            truncated = "".join(words[:keep]).rstrip() + TRUNCATION_MARKER
+            if self.count(truncated) <= max_tokens:
+                return truncated
+            keep = int(keep * 0.9)
+        return ""
+
+    def fit(self, template: str, parts: Dict[str, str], keep: Sequence[str] = ()) -> Dict[str, str]:
+        """
+        Shorten the values of `parts` so that `template` filled with them fits the budget.
+
+        Parts named in `keep` are never shortened. The room left after the template
+        and the kept parts is shared evenly: parts smaller than their share are kept
+        whole and the rest of their share goes to the larger parts, which are
+        truncated.
+
+        Args:
+            template (str): Prompt template with `{name}` placeholders.
+            parts (Dict[str, str]): Values for the placeholders.
+            keep (Sequence[str]): Names of parts that must be kept whole.
+
+        Returns:
+            Dict[str, str]: The values to format the template with.
+        """
+        fitted = dict(parts)
+        remaining = self.available - self.count(template.format(**{name: "" for name in parts}))
+        remaining -= sum(self.count(parts[name]) for name in keep if name in parts)
+
+        sizes = {name: self.count(text) for name, text in parts.items() if name not in keep}
+        if sum(sizes.values()) <= remaining:
+            return fitted
+
+        pending = sorted(sizes, key=sizes.get)
+        while pending:
+            share = max(0, remaining) // len(pending)
+            name = pending.pop(0)
+            if sizes[name] <= share:
+                remaining -= sizes[name]
+                continue
+            # Every remaining part is at least as large as this one: split the rest evenly
+            for name in [name] + pending:
+                fitted[name] = self.truncate(parts[name], share)
+            break
+        return fitted
+
+
+def compact_analysis(analysis: str, max_bullets: int = 3) -> str:
+    """
+    Reduce a question analysis to its scores and its most important bullet points.
+
+    Analyses that do not follow the structured format are returned unchanged; the
+    token budget shortens them if needed.
+    """
+    scores = []
+    bullets = []
+    for line in analysis.splitlines():
+        if _SECTION_LINE.match(line):
+            continue
+        score = _SCORE_LINE.match(line)
+        if score:
+            scores.append(f"{score.group(1).strip()} {score.group(2)}")
+            continue
+        bullet = _BULLET_LINE.match(line)
+        if bullet and len(bullets) < max_bullets:
+            text = bullet.group(1).replace("**", "").strip()
+            # Skip template prompts the model left unanswered, such as "Key strengths:"
+            if not text.endswith(":"):
+                bullets.append(f"- {text}")
+    if not scores and not bullets:
+        return analysis.strip()
+    lines = [f"Scores: {', '.join(scores)}"] if scores else []
+    return "\n".join(lines + bullets)
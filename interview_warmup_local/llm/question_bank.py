@@ -0,0 +1,200 @@
+# standard imports
+import hashlib
+import json
+import os
+import numpy as np
+from pathlib import Path
+from loguru import logger
+
+# custom imports
+from interview_warmup_local.metrics import metrics
+
+# typing imports
+from interview_warmup_local.utils import QuestionBankConfig
+from typing import List, Optional, Sequence
+from llama_index.core.base.embeddings.base import BaseEmbedding
+
+
+class QuestionBank:
+    """
+    Embedded question bank for picking the questions that fit a job description.
+
+    The unit-length question embeddings are stored as a `.npy` matrix keyed by the
+    hash of the bank and memory-mapped when loaded, so a bank of thousands of
+    questions is embedded once and shared through the page cache by every session.
+    Near-duplicates of earlier questions are left out of the matrix. Adding a
+    question embeds only that question and saves the extended matrix under the new
+    bank's hash.
+    """
+
+    # Dedup compares questions in blocks of this many rows
+    BLOCK_SIZE = 256
+    # Matrices of earlier versions of banks that are kept on disk
+    MAX_CACHED_BANKS = 8
+
+    def __init__(self, questions: Sequence[str], embed_model: BaseEmbedding, embed_model_name: str, config: QuestionBankConfig):
+        """
+        Load the index of `questions`, embedding them if it is not cached.
+
+        Args:
+            questions (Sequence[str]): The question bank, e.g. from `data/questions.json`.
+            embed_model (BaseEmbedding): Model embedding questions and job descriptions.
+            embed_model_name (str): Name of the embedding model, part of the cache key.
+            config (QuestionBankConfig): Question bank configuration.
+        """
+        self.embed_model = embed_model
+        self.embed_model_name = embed_model_name
+        self.config = config
+        self.cache_dir = Path(config.cache_dir)
+        self.source_questions = [question for question in questions if question.strip()]
+        self.questions: List[str] = []
+        self.embeddings = np.zeros((0, 0), dtype=np.float32)
+        self._load_or_build()
+
+    def _bank_key(self) -> str:
+        digest = hashlib.sha256(f"{self.embed_model_name}|{self.config.duplicate_threshold}".encode("utf-8"))
+        for question in self.source_questions:
+            digest.update(b"\0")
+            digest.update(question.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _load_or_build(self):
+        key = self._bank_key()
+        matrix_path = self.cache_dir / f"{key}.npy"
+        questions_path = self.cache_dir / f"{key}.json"
+        if matrix_path.exists() and questions_path.exists():
+            try:
+                with questions_path.open("r") as f:
+                    self.questions = json.load(f)
+                self.embeddings = np.load(matrix_path, mmap_mode="r")
+                metrics.increment("question_bank_cache_hits_total")
+                logger.info(f"Loaded question bank {key} with {len(self.questions)} questions")
+                return
+            except (OSError, ValueError) as e:
+                logger.warning(f"Rebuilding unreadable question bank {key}: {str(e)}")
+        metrics.increment("question_bank_cache_misses_total")
+
+        with metrics.span("question_bank_build", questions=len(self.source_questions)):
+            embeddings = self._embed(self.source_questions)
+            keep = self._deduplicate(embeddings)
+        self.questions = [self.source_questions[i] for i in keep]
+        self._save(key, embeddings[keep])
+        logger.info(f"Built question bank {key}: {len(self.questions)} of {len(self.source_questions)} questions after removing near-duplicates")
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as unit-length float32 rows."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        vectors = np.asarray(self.embed_model.get_text_embedding_batch(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _deduplicate(self, embeddings: np.ndarray) -> List[int]:
+        """
+        Indices of the rows to keep, dropping each row too similar to an earlier kept one.
+        """
+        threshold = self.config.duplicate_threshold
+        keep: List[int] = []
+        for start in range(0, len(embeddings), self.BLOCK_SIZE):
+            block = embeddings[start:start + self.BLOCK_SIZE]
+            if keep:
+                dropped = (block @ embeddings[keep].T).max(axis=1) >= threshold
+            else:
+                dropped = np.zeros(len(block), dtype=bool)
+            similarities = block @ block.T
+            for i in range(len(block)):
+                if dropped[i]:
+                    continue
+                keep.append(start + i)
+                dropped |= similarities[i] >= threshold
+        return keep
+
+    def _save(self, key: str, embeddings: np.ndarray):
+        """Write the bank under `key` and memory-map it."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            matrix_path = self.cache_dir / f"{key}.npy"
+            tmp_path = self.cache_dir / f".{key}.{os.getpid()}.tmp.npy"
+            np.save(tmp_path, embeddings)
+            os.replace(tmp_path, matrix_path)
+            questions_path = self.cache_dir / f"{key}.json"
+            with questions_path.with_suffix(".tmp").open("w") as f:
+                json.dump(self.questions, f)
+            os.replace(questions_path.with_suffix(".tmp"), questions_path)
+            self.embeddings = np.load(matrix_path, mmap_mode="r")
+            self._evict()
+        except OSError as e:
+            logger.error(f"Error persisting question bank {key}: {str(e)}")
+            self.embeddings = embeddings
+
+    def _evict(self):
+        """Remove the matrices of all but the most recently written banks."""
+        banks = sorted(self.cache_dir.glob("*.npy"), key=lambda path: path.stat().st_mtime, reverse=True)
+        for matrix_path in banks[self.MAX_CACHED_BANKS:]:
+            matrix_path.unlink(missing_ok=True)
+            matrix_path.with_suffix(".json").unlink(missing_ok=True)
+
+    def add(self, question: str) -> Optional[str]:
+        """
+        Add a question to the bank, unless it is a near-duplicate of one already in it.
+
+        Args:
+            question (str): The new question.
+
+        Returns:
+            Optional[str]: The existing question it duplicates, or None if it was added.
+        """
+        embedding = self._embed([question])
+        if len(self.questions):
+            similarities = np.asarray(self.embeddings @ embedding[0])
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.config.duplicate_threshold:
+                return self.questions[best]
+
+        self.source_questions.append(question)
+        self.questions.append(question)
+        embeddings = np.concatenate([self.embeddings, embedding]) if len(self.embeddings) else embedding
+        self._save(self._bank_key(), embeddings)
+        return None
+
+    def select(self, job_description: str, count: int) -> List[str]:
+        """
+        Pick `count` questions relevant to the job description and different from each other.
+
+        Candidates are the questions most similar to the job description; they are
+        picked greedily by maximal marginal relevance, weighing relevance against
+        similarity to the questions already picked by `relevance_weight`.
+
+        Args:
+            job_description (str): The job description.
+            count (int): Number of questions to pick.
+
+        Returns:
+            List[str]: The picked questions, most relevant first.
+        """
+        count = min(count, len(self.questions))
+        if count <= 0:
+            return []
+
+        with metrics.span("question_selection", questions=len(self.questions)):
+            query = np.asarray(self.embed_model.get_query_embedding(job_description), dtype=np.float32)
+            query /= max(float(np.linalg.norm(query)), 1e-12)
+            relevance = np.asarray(self.embeddings @ query)
+
+            pool_size = min(len(relevance), max(10 * count, 50))
+            candidates = np.argpartition(-relevance, pool_size - 1)[:pool_size]
+            vectors = np.asarray(self.embeddings[candidates])
+            relevance = relevance[candidates]
+
+            weight = self.config.relevance_weight
+            # Similarity of each candidate to its closest picked question; the starting
+            # value shifts every score equally, so the first pick is the most relevant
+            redundancy = np.full(pool_size, -1.0, dtype=np.float32)
+            picked: List[int] = []
+            for _ in range(count):
+                scores = weight * relevance - (1.0 - weight) * redundancy
+                scores[picked] = -np.inf
+                best = int(np.argmax(scores))
+                picked.append(best)
+                redundancy = np.maximum(redundancy, vectors @ vectors[best])
+        return [self.questions[candidates[i]] for i in picked]
@@ -0,0 +1,141 @@
+# standard imports
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from loguru import logger
+
+# custom imports
+
+# typing imports
+from interview_warmup_local.utils import LLMConfig
+from typing import Dict, Optional
+
+
+class ResponseCache:
+    """
+    Disk-backed cache of LLM responses stored in SQLite.
+
+    Entries older than `ttl_seconds` are ignored and purged, and once the stored
+    responses exceed `max_bytes` the least recently used ones are removed.
+    """
+
+    def __init__(self, path: str, max_bytes: int, ttl_seconds: Optional[float] = None):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self._connection.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, context: str = "") -> str:
+        """
+        Build the cache key for a rendered prompt.
+
+        Args:
+            model (str): Name of the LLM.
+            prompt (str): Fully rendered prompt.
+            context (str): Retrieved context the response is synthesized from.
+
+        Returns:
+            str: Hex digest identifying the response.
+        """
+        digest = hashlib.sha256()
+        for part in (model, prompt, context):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for `key`, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute("SELECT response, size, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or self._expired(row[2], now):
+                self.misses += 1
+                return None
+            self._connection.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+            self.hits += 1
+            self.bytes_read += row[1]
+            return row[0]
+
+    def put(self, key: str, response: str):
+        """Store a response and evict expired or least recently used entries."""
+        size = len(response.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now)
+            )
+            self.bytes_written += size
+            self._evict(now)
+            self._connection.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss and size counters for this process."""
+        with self._lock:
+            entries, size = self._connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "bytes_read": self.bytes_read,
+                "bytes_written": self.bytes_written,
+                "entries": entries,
+                "size_bytes": size,
+            }
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created > self.ttl_seconds
+
+    def _evict(self, now: float):
+        if self.ttl_seconds is not None:
+            self._connection.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._connection.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} cached responses")
+
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(llm_config: LLMConfig) -> Optional[ResponseCache]:
+    """
+    Return the process-wide response cache for the configuration, or None if caching is disabled.
+
+    Sharing one instance per cache file keeps the hit/miss counters for the whole process.
+    """
+    if not llm_config.response_cache_enabled:
+        return None
+    with _caches_lock:
+        cache = _caches.get(llm_config.response_cache_path)
+        if cache is None:
+            cache = ResponseCache(llm_config.response_cache_path, llm_config.response_cache_max_bytes, llm_config.response_cache_ttl_seconds)
+            _caches[llm_config.response_cache_path] = cache
+        return cache
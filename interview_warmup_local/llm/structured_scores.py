@@ -0,0 +1,91 @@
+# standard imports
+import json
+import numpy as np
+
+# custom imports
+from interview_warmup_local.utils import AnswerEvaluation, AnswerScores, OverallScores
+
+# typing imports
+from typing import List, Optional, Sequence
+
+
+CRITERIA = list(AnswerScores.model_fields)
+
+
+def validate_evaluation(response: str) -> AnswerEvaluation:
+    """
+    Parse the JSON evaluation in a model response, ignoring text before and after the object.
+
+    Models sometimes wrap the object in prose or a code fence despite being asked not to.
+
+    Raises:
+        ValueError: If the response holds no valid evaluation.
+    """
+    start = response.find("{")
+    if start < 0:
+        raise ValueError("The response contains no JSON object")
+    evaluation, _ = json.JSONDecoder().raw_decode(response, start)
+    return AnswerEvaluation.model_validate(evaluation)
+
+
+def parse_evaluation(analysis: str) -> Optional[AnswerEvaluation]:
+    """Parse a structured analysis, or return None if it is free text such as an error message."""
+    try:
+        return validate_evaluation(analysis)
+    except ValueError:
+        return None
+
+
+def aggregate_scores(evaluations: Sequence[AnswerEvaluation]) -> OverallScores:
+    """
+    Compute the overall scores of a session from the scores of its answers.
+
+    Consistency is 5 minus twice the standard deviation of the per-answer mean
+    scores, so equal answers score 5 and answers split between 1 and 5 score 1.
+    """
+    if not evaluations:
+        raise ValueError("No evaluations to aggregate")
+    # One row per answer, one column per criterion
+    matrix = np.array([[getattr(evaluation.scores, name) for name in CRITERIA] for evaluation in evaluations], dtype=np.float64)
+    answer_scores = matrix.mean(axis=1)
+    return OverallScores(
+        answers=len(evaluations),
+        criteria={name: round(float(score), 2) for name, score in zip(CRITERIA, matrix.mean(axis=0))},
+        answer_scores=[round(float(score), 2) for score in answer_scores],
+        overall=round(float(answer_scores.mean()), 2),
+        consistency=round(float(np.clip(5.0 - 2.0 * answer_scores.std(), 1.0, 5.0)), 2)
+    )
+
+
+def render_analysis(analysis: str) -> str:
+    """Markdown for an analysis: structured analyses are formatted, free text is returned as is."""
+    evaluation = parse_evaluation(analysis)
+    if evaluation is None:
+        return analysis
+    lines = ["**Scoring Matrix**:"]
+    lines += [f"- {AnswerScores.model_fields[name].title}: {getattr(evaluation.scores, name)}" for name in CRITERIA]
+    lines += ["", "**Detailed Feedback**:", f"- Does the answer provide enough useful information? {'Yes' if evaluation.enough_information else 'No'}"]
+    lines += [f"- Strength: {strength}" for strength in evaluation.strengths]
+    lines += [f"- Area for improvement: {improvement}" for improvement in evaluation.improvements]
+    lines.append(f"- Overall assessment of this answer: {evaluation.assessment}")
+    return "\n".join(lines)
+
+
+def render_overall_scores(scores: OverallScores) -> str:
+    """Markdown scoring matrix of the overall scores."""
+    lines = ["**Overall Scoring Matrix**:"]
+    lines += [f"- {AnswerScores.model_fields[name].title}: {score:.1f}" for name, score in scores.criteria.items()]
+    lines.append(f"- Consistency: {scores.consistency:.1f}")
+    lines.append(f"- Overall: {scores.overall:.1f}")
+    return "\n".join(lines)
+
+
+def summarize_evaluations(evaluations: Sequence[AnswerEvaluation], max_items: int = 2) -> str:
+    """Short text of each evaluation's assessment and main points, for the summary prompt."""
+    summaries: List[str] = []
+    for i, evaluation in enumerate(evaluations, start=1):
+        lines = [f"Question {i} (mean score {np.mean([getattr(evaluation.scores, name) for name in CRITERIA]):.1f}): {evaluation.assessment}"]
+        lines += [f"- Strength: {strength}" for strength in evaluation.strengths[:max_items]]
+        lines += [f"- To improve: {improvement}" for improvement in evaluation.improvements[:max_items]]
+        summaries.append("\n".join(lines))
+    return "\n\n".join(summaries)
@@ -0,0 +1,204 @@
+# standard imports
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from loguru import logger
+
+# custom imports
+
+# typing imports
+from typing import Any, Deque, Dict, Iterator, List, Tuple
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Metrics:
+    """
+    Process-wide collection of pipeline timings and counters.
+
+    Spans time a stage and are recorded as `<name>_seconds` summaries. Summaries
+    keep count, sum, min, max and the last value; counters only go up; gauges hold
+    the latest value. Everything can be exported as JSON or Prometheus text.
+    """
+
+    PREFIX = "interview_warmup_"
+
+    def __init__(self, max_recent_spans: int = 200):
+        self._lock = threading.Lock()
+        self._summaries: Dict[str, Dict[LabelKey, Dict[str, float]]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._recent_spans: Deque[Dict[str, Any]] = deque(maxlen=max_recent_spans)
+        self._servers: Dict[int, ThreadingHTTPServer] = {}
+
+    @contextmanager
+    def span(self, name: str, **labels: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Time the enclosed block as `<name>_seconds`.
+
+        Yields a dict that the block may fill with extra attributes; they are kept
+        with the span in the recent-span log.
+        """
+        attributes: Dict[str, Any] = {}
+        start = time.perf_counter()
+        error = None
+        try:
+            yield attributes
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            self.observe(f"{name}_seconds", duration, **labels)
+            with self._lock:
+                self._recent_spans.append({
+                    "name": name,
+                    "labels": {key: str(value) for key, value in labels.items()},
+                    "seconds": round(duration, 6),
+                    "finished_at": time.time(),
+                    "error": error,
+                    **attributes,
+                })
+
+    def observe(self, name: str, value: float, **labels: Any):
+        """Add a value to the summary `name`."""
+        key = self._label_key(labels)
+        with self._lock:
+            summary = self._summaries.setdefault(name, {}).get(key)
+            if summary is None:
+                self._summaries[name][key] = {"count": 1, "sum": value, "min": value, "max": value, "last": value}
+                return
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["min"] = min(summary["min"], value)
+            summary["max"] = max(summary["max"], value)
+            summary["last"] = value
+
+    def increment(self, name: str, value: float = 1, **labels: Any):
+        """Increase the counter `name`."""
+        key = self._label_key(labels)
+        with self._lock:
+            counter = self._counters.setdefault(name, {})
+            counter[key] = counter.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any):
+        """Set the gauge `name` to its latest value."""
+        with self._lock:
+            self._gauges.setdefault(name, {})[self._label_key(labels)] = value
+
+    def recent_spans(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._recent_spans)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as plain JSON-serializable data."""
+        with self._lock:
+            def entries(values: Dict[str, Dict[LabelKey, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+                return {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in values.items()
+                }
+            return {
+                "summaries": entries(self._summaries),
+                "counters": entries(self._counters),
+                "gauges": entries(self._gauges),
+                "recent_spans": list(self._recent_spans),
+            }
+
+    def to_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._summaries.items()):
+                metric = self.PREFIX + name
+                lines.append(f"# TYPE {metric} summary")
+                for key, summary in series.items():
+                    lines.append(f"{metric}_count{self._format_labels(key)} {summary['count']}")
+                    lines.append(f"{metric}_sum{self._format_labels(key)} {summary['sum']}")
+                lines.append(f"# TYPE {metric}_max gauge")
+                for key, summary in series.items():
+                    lines.append(f"{metric}_max{self._format_labels(key)} {summary['max']}")
+            for name, series in sorted(self._counters.items()):
+                metric = self.PREFIX + name
+                lines.append(f"# TYPE {metric} counter")
+                lines.extend(f"{metric}{self._format_labels(key)} {value}" for key, value in series.items())
+            for name, series in sorted(self._gauges.items()):
+                metric = self.PREFIX + name
+                lines.append(f"# TYPE {metric} gauge")
+                lines.extend(f"{metric}{self._format_labels(key)} {value}" for key, value in series.items())
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Write the metrics to `path`: Prometheus text for .prom/.txt files, JSON otherwise."""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        content = self.to_prometheus() if target.suffix in (".prom", ".txt") else json.dumps(self.snapshot(), indent=2)
+        tmp_path = target.with_suffix(target.suffix + ".tmp")
+        tmp_path.write_text(content)
+        tmp_path.replace(target)
+
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        """
+        Expose `/metrics` (Prometheus text) and `/metrics.json` over HTTP.
+
+        Starting a server on a port that is already served is a no-op, so this is
+        safe to call on every Streamlit rerun.
+        """
+        with self._lock:
+            if port in self._servers:
+                return
+            server = ThreadingHTTPServer((host, port), self._handler_class())
+            server.daemon_threads = True
+            self._servers[port] = server
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+
+    def reset(self):
+        with self._lock:
+            self._summaries.clear()
+            self._counters.clear()
+            self._gauges.clear()
+            self._recent_spans.clear()
+
+    def _handler_class(self):
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = json.dumps(metrics.snapshot()), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                payload = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    @staticmethod
+    def _label_key(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    @staticmethod
+    def _format_labels(key: LabelKey) -> str:
+        if not key:
+            return ""
+        escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in key)
+        return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(key, escaped)) + "}"
+
+
+metrics = Metrics()
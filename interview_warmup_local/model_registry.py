@@ -0,0 +1,130 @@
+# standard imports
+import threading
+import time
+from loguru import logger
+
+# custom imports
+
+# typing imports
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models.
+
+    Streamlit re-executes the app script on every interaction, but imported modules
+    stay loaded, so models kept here survive reruns and are shared between sessions.
+    Each model is loaded at most once per key, even when several threads request it
+    at the same time.
+    """
+
+    def __init__(self, idle_timeout: Optional[float] = None, max_models: Optional[int] = None):
+        self.idle_timeout = idle_timeout
+        self.max_models = max_models
+        self._models: Dict[Hashable, Any] = {}
+        self._last_used: Dict[Hashable, float] = {}
+        self._load_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, idle_timeout: Optional[float] = None, max_models: Optional[int] = None):
+        """
+        Update the eviction limits.
+
+        Args:
+            idle_timeout (Optional[float]): Seconds a model may go unused before it is evicted.
+            max_models (Optional[int]): Maximum number of models kept loaded at once.
+        """
+        with self._lock:
+            self.idle_timeout = idle_timeout
+            self.max_models = max_models
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the model stored under `key`, loading it with `loader` on first use.
+
+        Args:
+            key (Hashable): Identifies the model, usually built from the config fields it depends on.
+            loader (Callable[[], Any]): Loads the model when it is not in the registry.
+
+        Returns:
+            Any: The loaded model.
+        """
+        with self._lock:
+            if key in self._models:
+                self._last_used[key] = time.monotonic()
+                return self._models[key]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    self._last_used[key] = time.monotonic()
+                    return self._models[key]
+
+            logger.info(f"Loading model {key}")
+            model = loader()
+
+            with self._lock:
+                self._models[key] = model
+                self._last_used[key] = time.monotonic()
+                self._load_locks.pop(key, None)
+                self._evict_locked(keep=key)
+            return model
+
+    def evict(self, key: Hashable) -> bool:
+        """
+        Drop a model from the registry.
+
+        Returns:
+            bool: True if the model was loaded.
+        """
+        with self._lock:
+            self._last_used.pop(key, None)
+            return self._models.pop(key, None) is not None
+
+    def evict_idle(self, idle_timeout: Optional[float] = None) -> int:
+        """
+        Drop every model that has not been used within `idle_timeout` seconds.
+
+        Args:
+            idle_timeout (Optional[float]): Overrides the configured idle timeout.
+
+        Returns:
+            int: Number of evicted models.
+        """
+        with self._lock:
+            return self._evict_idle_locked(idle_timeout if idle_timeout is not None else self.idle_timeout)
+
+    def clear(self):
+        """Drop all models."""
+        with self._lock:
+            self._models.clear()
+            self._last_used.clear()
+
+    def _evict_locked(self, keep: Hashable):
+        self._evict_idle_locked(self.idle_timeout, keep=keep)
+        if self.max_models is None:
+            return
+        for key in sorted(self._last_used, key=self._last_used.get):
+            if len(self._models) <= self.max_models:
+                break
+            if key != keep:
+                self._drop_locked(key)
+
+    def _evict_idle_locked(self, idle_timeout: Optional[float], keep: Optional[Hashable] = None) -> int:
+        if idle_timeout is None:
+            return 0
+        now = time.monotonic()
+        idle = [key for key, used in self._last_used.items() if key != keep and now - used > idle_timeout]
+        for key in idle:
+            self._drop_locked(key)
+        return len(idle)
+
+    def _drop_locked(self, key: Hashable):
+        self._models.pop(key, None)
+        self._last_used.pop(key, None)
+        logger.info(f"Evicted model {key}")
+
+
+model_registry = ModelRegistry()
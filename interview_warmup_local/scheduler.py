@@ -0,0 +1,270 @@
+# standard imports
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, Future
+from loguru import logger
+
+# custom imports
+from interview_warmup_local.metrics import metrics
+
+# typing imports
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+
+class FairQueue:
+    """
+    Bounded queue shared by several sessions.
+
+    Items are queued per session and handed out round-robin, one session at a time,
+    so a session with many queued items cannot starve the others. `put` blocks while
+    the queue is full, pushing back on the submitting session.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._sessions: "OrderedDict[str, Deque[Any]]" = OrderedDict()
+        self._size = 0
+        self._condition = threading.Condition()
+
+    def __len__(self) -> int:
+        with self._condition:
+            return self._size
+
+    def put(self, session_id: str, item: Any, timeout: Optional[float] = None):
+        """
+        Queue `item` for `session_id`.
+
+        Raises:
+            queue.Full: If the queue stayed full for `timeout` seconds.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._size < self.maxsize, timeout):
+                raise queue.Full
+            self._sessions.setdefault(session_id, deque()).append(item)
+            self._size += 1
+            self._condition.notify_all()
+
+    def get_batch(self, max_items: int, max_wait: float = 0.0) -> List[Any]:
+        """
+        Take up to `max_items` items, blocking until at least one is available.
+
+        After the first item, waits up to `max_wait` seconds for the batch to fill.
+        Items are taken round-robin across sessions.
+        """
+        batch: List[Any] = []
+        with self._condition:
+            self._condition.wait_for(lambda: self._size > 0)
+            deadline = time.monotonic() + max_wait
+            while len(batch) < max_items:
+                if self._size == 0:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._condition.wait_for(lambda: self._size > 0, remaining):
+                        break
+                session_id, items = next(iter(self._sessions.items()))
+                batch.append(items.popleft())
+                self._size -= 1
+                if items:
+                    self._sessions.move_to_end(session_id)
+                else:
+                    del self._sessions[session_id]
+            self._condition.notify_all()
+        return batch
+
+
+class WorkerPool:
+    """
+    A fixed number of worker threads serving a `FairQueue`.
+
+    Queued items are passed to `_process` in batches of up to `max_batch_size`
+    items. Queue depth, queue wait, batch size and busy workers are reported to the
+    metrics under the pool's name.
+    """
+
+    def __init__(self, name: str, workers: int, max_queue: int, max_batch_size: int = 1, max_wait: float = 0.0, submit_timeout: Optional[float] = None):
+        self.name = name
+        self.workers = workers
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.submit_timeout = submit_timeout
+        self._queue = FairQueue(max_queue)
+        self._threads: List[threading.Thread] = []
+        self._busy = 0
+        self._lock = threading.Lock()
+
+    def _enqueue(self, session_id: str, payload: Any) -> Future:
+        future: Future = Future()
+        try:
+            self._queue.put(session_id, (payload, future, time.perf_counter()), self.submit_timeout)
+        except queue.Full:
+            metrics.increment("scheduler_rejected_total", pool=self.name)
+            logger.warning(f"Scheduler pool {self.name} is full; rejecting work from session {session_id}")
+            raise
+        metrics.set_gauge("scheduler_queue_depth", len(self._queue), pool=self.name)
+        self._ensure_workers()
+        return future
+
+    def _ensure_workers(self):
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._run, name=f"{self.name}-worker-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+
+    def _run(self):
+        while True:
+            batch = self._queue.get_batch(self.max_batch_size, self.max_wait)
+            now = time.perf_counter()
+            metrics.set_gauge("scheduler_queue_depth", len(self._queue), pool=self.name)
+            metrics.observe("scheduler_batch_size", len(batch), pool=self.name)
+            live = []
+            for payload, future, enqueued_at in batch:
+                metrics.observe("scheduler_wait_seconds", now - enqueued_at, pool=self.name)
+                if future.set_running_or_notify_cancel():
+                    live.append((payload, future))
+            if not live:
+                continue
+            with self._lock:
+                self._busy += 1
+                metrics.set_gauge("scheduler_busy_workers", self._busy, pool=self.name)
+            try:
+                self._process(live)
+            finally:
+                with self._lock:
+                    self._busy -= 1
+                    metrics.set_gauge("scheduler_busy_workers", self._busy, pool=self.name)
+
+    def _process(self, batch: List[Tuple[Any, Future]]):
+        for (fn, args, kwargs), future in batch:
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, session_id: str, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        """
+        Run `fn(*args, **kwargs)` on a worker on behalf of `session_id`.
+
+        Raises:
+            queue.Full: If the pool's queue stayed full for `submit_timeout` seconds.
+        """
+        return self._enqueue(session_id, (fn, args, kwargs))
+
+    def depth(self) -> int:
+        return len(self._queue)
+
+
+class MicroBatcher(WorkerPool):
+    """
+    Worker pool that runs single items through a batch function.
+
+    Items submitted by any session within `max_wait` seconds of each other are
+    combined into one call of `batch_fn`, up to `max_batch_size` items.
+    """
+
+    def __init__(self, name: str, batch_fn: Callable[[List[Any]], Sequence[Any]], workers: int, max_queue: int, max_batch_size: int, max_wait: float, submit_timeout: Optional[float] = None):
+        super().__init__(name, workers, max_queue, max_batch_size, max_wait, submit_timeout)
+        self.batch_fn = batch_fn
+
+    def submit(self, session_id: str, item: Any) -> Future:
+        """Queue `item`; the future resolves to its entry in the batch result."""
+        return self._enqueue(session_id, item)
+
+    def _process(self, batch: List[Tuple[Any, Future]]):
+        try:
+            results = self.batch_fn([item for item, _ in batch])
+        except BaseException as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+class SessionExecutor(Executor):
+    """`Executor` view of a worker pool that submits on behalf of one session."""
+
+    def __init__(self, pool: WorkerPool, session_id: str):
+        self.pool = pool
+        self.session_id = session_id
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Future:
+        return self.pool.submit(self.session_id, fn, *args, **kwargs)
+
+
+class InferenceScheduler:
+    """
+    Process-wide scheduler for model work shared by all sessions.
+
+    LLM requests run on the `llm` worker pool and Whisper windows on an `stt` pool
+    per model. Embedding queries go through micro-batchers, one per model, so
+    requests from concurrent sessions share model calls. Every pool has a bounded
+    queue served round-robin across sessions.
+    """
+
+    def __init__(self):
+        self._pools: Dict[str, WorkerPool] = {}
+        self._lock = threading.Lock()
+        self.configure()
+
+    def configure(self,
+                  llm_workers: int = 4,
+                  stt_workers: int = 4,
+                  embedding_workers: int = 1,
+                  max_queue: int = 256,
+                  submit_timeout: Optional[float] = 60.0,
+                  batch_wait_seconds: float = 0.005):
+        """
+        Update the pool sizes and queue limits.
+
+        Pools that already exist keep their queue; they gain workers if the new size
+        is larger, while extra workers of a smaller size stay until the process exits.
+        """
+        with self._lock:
+            self.llm_workers = llm_workers
+            self.stt_workers = stt_workers
+            self.embedding_workers = embedding_workers
+            self.max_queue = max_queue
+            self.submit_timeout = submit_timeout
+            self.batch_wait_seconds = batch_wait_seconds
+            for pool in self._pools.values():
+                pool.workers = max(pool.workers, self._workers_for(pool.name))
+                pool.submit_timeout = submit_timeout
+
+    def _workers_for(self, name: str) -> int:
+        kind = name.split(":", 1)[0]
+        # Document preparation is dominated by embedding the chunks of the index
+        return {"llm": self.llm_workers, "stt": self.stt_workers, "embedding": self.embedding_workers,
+                "documents": self.embedding_workers}.get(kind, 1)
+
+    def executor(self, name: str, session_id: str) -> SessionExecutor:
+        """Executor running tasks on the worker pool `name` (e.g. "llm") for `session_id`."""
+        with self._lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                pool = WorkerPool(name, self._workers_for(name), self.max_queue, submit_timeout=self.submit_timeout)
+                self._pools[name] = pool
+        return SessionExecutor(pool, session_id)
+
+    def batcher(self, name: str, batch_fn: Callable[[List[Any]], Sequence[Any]], max_batch_size: int) -> MicroBatcher:
+        """
+        Return the micro-batcher `name`, creating it with `batch_fn` on first use.
+
+        The name should identify the model behind `batch_fn` and start with its kind,
+        e.g. "embedding:<model>" or "stt:<model>", which selects the worker count.
+        """
+        with self._lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                pool = MicroBatcher(name, batch_fn, self._workers_for(name), self.max_queue, max_batch_size, self.batch_wait_seconds, self.submit_timeout)
+                self._pools[name] = pool
+            return pool
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth of every pool."""
+        with self._lock:
+            return {name: pool.depth() for name, pool in self._pools.items()}
+
+
+scheduler = InferenceScheduler()
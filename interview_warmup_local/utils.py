@@ -1,15 +1,19 @@
 # standard imports
 from yaml import safe_load
 from pathlib import Path
-import subprocess
-import shutil
+import json
+import math
+import re
+import threading
+import time
+import urllib.request
 from loguru import logger
 
 # custom imports
 
 # typing imports
-from typing import Any, Dict, List
-from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional, Union
+from pydantic import BaseModel, Field, field_validator
 
 
 class VoiceModelConfig(BaseModel):
@@ -17,20 +21,111 @@ class VoiceModelConfig(BaseModel):
     channels: int = Field(default=1, description="Number of channels")
     sample_rate: int = Field(default=16000, description="Sample rate")
     chunk_size: int = Field(default=4096, description="Chunk size")
-    frames_per_buffer: int = Field(default=8192, description="Frames per buffer")
-    model_type: str = Field(default="vosk", description="Model type")
+    frames_per_buffer: int = Field(default=4096, description="Frames per buffer")
+    model_type: str = Field(default="vosk", description="Speech recognition backend: vosk, whisper or faster-whisper")
+    whisper_model: str = Field(default="tiny.en", description="Whisper model size (e.g. tiny.en, base.en, small.en) or path to a model for the whisper and faster-whisper backends")
+    compute_type: str = Field(default="int8", description="CTranslate2 compute type for faster-whisper, e.g. int8, int8_float32 or float32")
+    cpu_threads: Optional[int] = Field(default=None, description="CPU threads used by the Whisper backends; None uses the library default")
+    beam_size: int = Field(default=1, description="Beam size for Whisper decoding; 1 decodes greedily")
+    language: Optional[str] = Field(default="en", description="Spoken language passed to Whisper; None detects it from the audio")
+    stop_phrase: str = Field(default="stop now", description="Phrase that ends a recording")
+    stop_phrase_model_path: Optional[str] = Field(default=None, description="Small Vosk model used to spot the stop phrase when Whisper is the recognizer; None searches the Whisper transcript")
+    capture_queue_seconds: float = Field(default=30.0, description="Seconds of captured audio buffered while recognition catches up")
+    window_seconds: float = Field(default=5.0, description="Length of each Whisper transcription window in seconds")
+    window_overlap_seconds: float = Field(default=1.0, description="Overlap between consecutive Whisper windows in seconds")
+    vad_energy_threshold: float = Field(default=0.01, description="RMS energy of a 30 ms frame below which it counts as silence; Whisper windows with fewer than 3 louder frames are skipped")
 
 class LLMConfig(BaseModel):
     model: str = Field(..., description="LLM model")
+    base_url: str = Field(default="http://localhost:11434", description="Ollama server URL")
     request_timeout: float = Field(default=60.0, description="Request timeout")
     chunk_size: int = Field(default=512, description="Chunk size")
     chunk_overlap: int = Field(default=75, description="Chunk overlap")
     embed_model: str = Field(default="BAAI/bge-small-en-v1.5", description="Embedding model")
+    embed_batch_size: int = Field(default=32, description="Number of texts embedded per batch")
+    embed_query_instruction: Optional[str] = Field(default=None, description="Instruction prepended to retrieval queries before embedding; None uses the llama-index default for embed_model")
     prompt_template: Dict[str, str] = Field(..., description="Prompt template")
+    max_concurrent_requests: int = Field(default=4, description="Maximum number of question analyses the batch evaluation CLI sends to the LLM at once; the app and process_interview_data use scheduler.llm_workers")
+    response_cache_enabled: bool = Field(default=True, description="Serve repeated prompts from the response cache instead of calling the LLM")
+    response_cache_path: str = Field(default="./data/cache/responses.sqlite3", description="SQLite file for cached LLM responses")
+    response_cache_max_bytes: int = Field(default=64 * 1024 * 1024, description="Maximum total size of cached responses")
+    response_cache_ttl_seconds: Optional[float] = Field(default=7 * 24 * 3600, description="Seconds a cached response stays valid; None keeps responses until evicted")
+    text_cache_dir: Optional[str] = Field(default="./data/cache/text", description="Directory for text extracted from resumes and job descriptions; None keeps it in memory only")
+    text_cache_max_bytes: int = Field(default=64 * 1024 * 1024, description="Maximum size of the extracted text cache on disk")
+    index_cache_enabled: bool = Field(default=True, description="Persist vector indexes and reuse them for identical documents")
+    index_cache_dir: str = Field(default="./data/cache/index", description="Directory for persisted vector indexes")
+    index_cache_max_bytes: int = Field(default=512 * 1024 * 1024, description="Maximum size of the index cache on disk")
+    availability_timeout: float = Field(default=2.0, description="Seconds to wait for Ollama when checking which models are available")
+    context_window: int = Field(default=4096, description="Context window in tokens; sent to Ollama as num_ctx and used to budget prompts")
+    response_token_reserve: int = Field(default=768, description="Tokens of the context window kept free for the model's response")
+    prompt_budget_margin: float = Field(default=0.8, gt=0, le=1, description="Fraction of the rest of the context window prompts may fill as counted by tiktoken, leaving headroom for the model's own tokenizer")
+    keep_alive: Optional[Union[float, str]] = Field(default="30m", description="How long Ollama keeps the model loaded after a request, e.g. '30m' or -1 for indefinitely")
+    structured_output: bool = Field(default=False, description="Get answer scores as JSON and aggregate them locally instead of asking the LLM for the overall scores")
+
+class AnswerScores(BaseModel):
+    relevance: int = Field(..., ge=1, le=5, title="Relevance", description="Relevance of the answer to the question and job description")
+    clarity: int = Field(..., ge=1, le=5, title="Clarity", description="Clarity and coherence of the answer")
+    alignment: int = Field(..., ge=1, le=5, title="Alignment", description="Alignment with the job description requirements")
+    use_of_experience: int = Field(..., ge=1, le=5, title="Use of Experience", description="Use of experience from the resume")
+    depth: int = Field(..., ge=1, le=5, title="Depth of Information", description="Depth and usefulness of the information provided")
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def _round_score(cls, value: Any) -> Any:
+        """Accept near-miss scores from the model, such as 3.5, "4/5" or 6, rounded and clamped to 1-5."""
+        if isinstance(value, str):
+            match = re.match(r"\s*(\d+(?:\.\d+)?)", value)
+            if match is None:
+                return value
+            value = float(match.group(1))
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return min(5, max(1, math.floor(value + 0.5)))
+        return value
+
+class AnswerEvaluation(BaseModel):
+    scores: AnswerScores = Field(..., description="Scores from 1 (poor) to 5 (excellent) per criterion")
+    enough_information: bool = Field(..., description="Whether the answer provides enough useful information")
+    strengths: List[str] = Field(default_factory=list, description="Key strengths of the answer")
+    improvements: List[str] = Field(default_factory=list, description="Areas for improvement")
+    assessment: str = Field(..., description="Overall assessment of the answer")
+
+class OverallScores(BaseModel):
+    answers: int = Field(..., description="Number of evaluated answers")
+    criteria: Dict[str, float] = Field(..., description="Mean score of each criterion across the answers")
+    answer_scores: List[float] = Field(..., description="Mean score of each answer across the criteria")
+    overall: float = Field(..., description="Mean score across all answers and criteria")
+    consistency: float = Field(..., description="5 minus twice the standard deviation of the answer scores, clipped to 1-5")
+
+class ModelRegistryConfig(BaseModel):
+    idle_timeout: Optional[float] = Field(default=None, description="Seconds a model may stay unused before it is unloaded")
+    max_models: Optional[int] = Field(default=None, description="Maximum number of models kept loaded at once")
+
+class SchedulerConfig(BaseModel):
+    llm_workers: int = Field(default=4, description="LLM requests in flight across all sessions")
+    stt_workers: int = Field(default=4, description="Whisper windows transcribed at once, e.g. the number of sessions recording concurrently; windows are not batched, and openai-whisper still runs one window at a time")
+    embedding_workers: int = Field(default=1, description="Worker threads running query embedding")
+    max_queue: int = Field(default=256, description="Maximum queued tasks per worker pool")
+    submit_timeout: Optional[float] = Field(default=60.0, description="Seconds a session waits for room in a full queue before its request fails; None waits indefinitely")
+    batch_wait_seconds: float = Field(default=0.005, description="Seconds an embedding micro-batch waits to be joined by requests from other sessions")
+
+class MetricsConfig(BaseModel):
+    export_path: Optional[str] = Field(default=None, description="File the metrics are written to after each stage (.prom for Prometheus text, JSON otherwise)")
+    http_port: Optional[int] = Field(default=None, description="Port serving /metrics and /metrics.json")
+    debug_panel: bool = Field(default=False, description="Show stage timings in the app sidebar")
+
+class QuestionBankConfig(BaseModel):
+    questions_per_session: int = Field(default=1, description="Number of questions picked from the bank for a practice session")
+    relevance_weight: float = Field(default=0.7, description="MMR trade-off between relevance to the job description (1.0) and diversity among the picked questions (0.0)")
+    duplicate_threshold: float = Field(default=0.92, description="Cosine similarity at which a question counts as a near-duplicate of an earlier one")
+    cache_dir: str = Field(default="./data/cache/question_bank", description="Directory for the embedding matrices of question banks")
 
 class ConfigModel(BaseModel):
     voice_model: VoiceModelConfig = Field(..., description="Voice model configuration")
     llm: LLMConfig = Field(..., description="LLM configuration")
+    model_registry: ModelRegistryConfig = Field(default_factory=ModelRegistryConfig, description="Model registry configuration")
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig, description="Metrics configuration")
+    scheduler: SchedulerConfig = Field(default_factory=SchedulerConfig, description="Inference scheduler configuration")
+    question_bank: QuestionBankConfig = Field(default_factory=QuestionBankConfig, description="Question bank configuration")
 
 
 def read_config(config_path: str) -> ConfigModel:
@@ -61,29 +156,85 @@ def read_config(config_path: str) -> ConfigModel:
         raise ValueError(f"Invalid config file: {e}")
     
 
-def download_ollama_model(model: str):
+# Seconds an unreachable server is reported without being queried again
+OLLAMA_RETRY_SECONDS = 10.0
+
+_ollama_models: Dict[str, List[str]] = {}
+# Time of the last failed check of each unreachable server
+_ollama_failures: Dict[str, float] = {}
+_ollama_models_lock = threading.Lock()
+
+
+def list_ollama_models(base_url: str = "http://localhost:11434", timeout: float = 2.0, refresh: bool = False) -> Optional[List[str]]:
+    """
+    List the models available on an Ollama server.
+
+    The model list is cached per server for the lifetime of the process, so
+    Streamlit reruns do not query Ollama again. An unreachable server is only
+    remembered for `OLLAMA_RETRY_SECONDS`, so a server started later is found.
+
+    Args:
+        base_url (str): Ollama server URL.
+        timeout (float): Seconds to wait for the server before giving up.
+        refresh (bool): Query the server even if a cached result exists.
+
+    Returns:
+        Optional[List[str]]: Model names, or None if the server could not be reached.
+    """
+    with _ollama_models_lock:
+        if not refresh:
+            if base_url in _ollama_models:
+                return _ollama_models[base_url]
+            if time.monotonic() - _ollama_failures.get(base_url, -OLLAMA_RETRY_SECONDS) < OLLAMA_RETRY_SECONDS:
+                return None
+        try:
+            with urllib.request.urlopen(f"{base_url.rstrip('/')}/api/tags", timeout=timeout) as response:
+                payload = json.load(response)
+        except (OSError, ValueError) as e:
+            logger.error(f"Ollama is not reachable at {base_url}: {e}")
+            _ollama_failures[base_url] = time.monotonic()
+            return None
+        _ollama_failures.pop(base_url, None)
+        _ollama_models[base_url] = [model["name"] for model in payload.get("models", [])]
+        return _ollama_models[base_url]
+
+
+def _ollama_model_matches(name: str, model: str) -> bool:
+    # Models pulled without a tag are listed as `<model>:latest`
+    return name == model or (":" not in model and name == f"{model}:latest")
+
+
+def download_ollama_model(model: str, base_url: str = "http://localhost:11434", timeout: float = 2.0):
     """
     Download an Ollama model if it doesn't exist.
-    
+
+    Availability is checked once per process through the Ollama HTTP API.
+
     Args:
         model (str): Name of the model to download.
+        base_url (str): Ollama server URL.
+        timeout (float): Seconds to wait for the availability check.
     """
-    if not shutil.which("ollama"):
-        logger.error("Ollama is not installed or not in PATH. Please install Ollama first.")
+    models = list_ollama_models(base_url, timeout)
+    if models is None:
+        return
+    if any(_ollama_model_matches(name, model) for name in models):
+        logger.debug(f"Ollama model {model} already exists.")
         return
 
     try:
-        # Check if the model exists
-        result = subprocess.run(["ollama", "list"], capture_output=True, text=True)
-        if model not in result.stdout:
-            logger.info(f"Downloading Ollama model: {model}")
-            subprocess.run(["ollama", "pull", model], check=True)
-            logger.info(f"Successfully downloaded Ollama model: {model}")
-        else:
-            logger.info(f"Ollama model {model} already exists.")
-    except subprocess.CalledProcessError as e:
+        logger.info(f"Downloading Ollama model: {model}")
+        request = urllib.request.Request(
+            f"{base_url.rstrip('/')}/api/pull",
+            data=json.dumps({"name": model, "model": model, "stream": False}).encode("utf-8"),
+            headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request) as response:
+            status = json.load(response).get("status")
+        if status != "success":
+            raise ValueError(f"unexpected pull status {status!r}")
+        with _ollama_models_lock:
+            models.append(model)
+        logger.info(f"Successfully downloaded Ollama model: {model}")
+    except (OSError, ValueError) as e:
         logger.error(f"Error downloading Ollama model {model}: {e}")
-    except Exception as e:
-        logger.error(f"Unexpected error while processing Ollama model {model}: {e}")
-
-
@@ -1,25 +1,40 @@
 # standard imports
 import streamlit as st
-import random
 from pathlib import Path
 import json
+import uuid
 
 # custom imports
 from interview_warmup_local.utils import read_config
 from interview_warmup_local.audio.speech_to_text import initialize_speech_to_text
-from interview_warmup_local.llm.local_llm import InterviewAnalyzer
 from interview_warmup_local.utils import download_ollama_model
+from interview_warmup_local.model_registry import model_registry
+from interview_warmup_local.metrics import metrics
+from interview_warmup_local.scheduler import scheduler
+from interview_warmup_local.llm.structured_scores import render_analysis
 
 # typing imports
 from typing import List, Dict
 from interview_warmup_local.utils import ConfigModel
 
 def initialize_app(config: ConfigModel):
-    # Initialize speech-to-text model
-    stt_model = initialize_speech_to_text(config.voice_model)
+    model_registry.configure(
+        idle_timeout=config.model_registry.idle_timeout,
+        max_models=config.model_registry.max_models
+    )
+    model_registry.evict_idle()
+    scheduler.configure(**config.scheduler.model_dump())
+    if config.metrics.http_port is not None:
+        metrics.serve(config.metrics.http_port)
+
+    # Initialize speech-to-text model (the underlying model is loaded once per process)
+    stt_model = initialize_speech_to_text(config.voice_model, st.session_state.session_id)
     return stt_model
 
 def main(config: ConfigModel):
+    # Identifies this browser session's work to the inference scheduler
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
     stt_model = initialize_app(config)
     st.set_page_config(page_title="Interview Warmup Local", layout="wide")
     st.title("Interview Warmup Local")
@@ -38,6 +53,34 @@ def main(config: ConfigModel):
     elif st.session_state.page == 'evaluation':
         evaluation_page()
 
+    if config.metrics.debug_panel:
+        metrics_panel()
+
+def export_metrics():
+    if config.metrics.export_path:
+        metrics.write(config.metrics.export_path)
+
+def metrics_panel():
+    with st.sidebar.expander("Stage timings"):
+        spans = metrics.recent_spans()[-20:]
+        st.dataframe([{"stage": s["name"], "seconds": s["seconds"], **s["labels"]} for s in reversed(spans)])
+        st.json(metrics.snapshot()["summaries"], expanded=False)
+
+def get_question_bank():
+    """The embedded question bank of this session, loaded or built on first use."""
+    if st.session_state.get('question_bank') is None:
+        # llama-index and the embedding model are only loaded once questions are added or picked
+        from interview_warmup_local.llm.local_llm import get_embed_model
+        from interview_warmup_local.llm.question_bank import QuestionBank
+        with st.spinner("Indexing the question bank..."):
+            st.session_state.question_bank = QuestionBank(
+                st.session_state.questions,
+                get_embed_model(config.llm),
+                config.llm.embed_model,
+                config.question_bank
+            )
+    return st.session_state.question_bank
+
 def input_page():
     st.header("Prepare for Your Interview")
 
@@ -69,8 +112,12 @@ def input_page():
     new_question = st.text_input("Add a new question:")
     if st.button("Add Question"):
         if new_question:
-            st.session_state.questions.append(new_question)
-            st.success("New question added successfully!")
+            duplicate = get_question_bank().add(new_question)
+            if duplicate is None:
+                st.session_state.questions.append(new_question)
+                st.success("New question added successfully!")
+            else:
+                st.warning(f"A similar question is already in the bank: {duplicate}")
         else:
             st.warning("Please enter a question before adding.")
     st.write(st.session_state.questions)
@@ -111,8 +158,16 @@ def input_page():
                 with open(resume_path, "wb") as f:
                     f.write(st.session_state.resume.getbuffer())
 
+            # Parse the documents, build the index and load the model while the candidate practices
+            from interview_warmup_local.llm.evaluation_pipeline import EvaluationPipeline
+            st.session_state.pipeline = EvaluationPipeline(config.llm, st.session_state.session_id)
+            st.session_state.pipeline.prepare(str(resume_path), str(job_description_file))
+
             st.session_state.page = 'practice'
-            st.session_state.practice_questions = random.sample(st.session_state.questions, 1) # this needs to go as config setting
+            st.session_state.practice_questions = get_question_bank().select(
+                st.session_state.job_description,
+                config.question_bank.questions_per_session
+            )
             st.session_state.current_question = 0
             st.session_state.answers = []
             st.success("Data saved successfully. Starting practice...")
@@ -135,14 +190,17 @@ def practice_page(stt_model):
             st.session_state[f"answer_{i}"] = ""
 
         if st.button("🎙️ Record", key=f"record_btn_{i}"):
-            st.write("Say 'stop now' to end recording")
+            st.write(f"Say '{stt_model.config.stop_phrase}' to end recording")
             
             # Call the speech_to_text function with the initialized model
             answer = stt_model.transcribe_audio()
+            export_metrics()
             
             # Store the answer
             st.session_state[f"answer_{i}"] = answer
             st.session_state.answers = [st.session_state.get(f"answer_{j}", "") for j in range(len(st.session_state.practice_questions))]
+            if answer:
+                st.session_state.pipeline.submit_answer(i, question, answer)
 
         # Display and allow editing of the answer
         if st.session_state[f"answer_{i}"]:
@@ -153,6 +211,8 @@ def practice_page(stt_model):
             if st.button("✏️ Update Answer", key=f"update_btn_{i}"):
                 st.session_state[f"answer_{i}"] = edited_answer
                 st.session_state.answers = [st.session_state.get(f"answer_{j}", "") for j in range(len(st.session_state.practice_questions))]
+                # Replaces the analysis of the previous answer
+                st.session_state.pipeline.submit_answer(i, question, edited_answer)
                 st.success("Answer updated successfully!")
         
         # Always display the current answer for this question
@@ -174,42 +234,40 @@ def evaluation_page():
     st.write("Thank you for completing the practice interview!")
     st.write("Your answers are being evaluated...")
 
-    # Initialize InterviewAnalyzer
-    analyzer = InterviewAnalyzer(config.llm)
+    # Documents were loaded and answers analyzed in the background during the session
+    pipeline = st.session_state.pipeline
 
-    resume_path = "./data/" + st.session_state.resume.name
-    job_description_path = "./data/job_description.txt"
-    
-    with st.spinner("Analyzing your responses..."):
-        analyses = analyzer.process_interview_data(
-            resume_path, 
-            job_description_path, 
-            st.session_state.practice_questions, 
-            st.session_state.answers
-        )
-
-    # Display individual question-answer evaluations
-    for q, a, analysis in zip(st.session_state.practice_questions, st.session_state.answers, analyses):
-        with st.expander(f"Question: {q}"):
-            st.subheader("Your Answer:")
-            st.write(a)
-            st.subheader("Evaluation:")
-            st.write(analysis)
+    with metrics.span("evaluation", questions=len(st.session_state.practice_questions)):
+        analyses = []
+        for i, (q, a) in enumerate(zip(st.session_state.practice_questions, st.session_state.answers)):
+            with st.expander(f"Question: {q}", expanded=True):
+                st.subheader("Your Answer:")
+                st.write(a)
+                st.subheader("Evaluation:")
+                if pipeline.llm_config.structured_output:
+                    # Structured analyses are only rendered once they are complete
+                    with st.spinner("Finishing the evaluation of this answer..."):
+                        analysis = pipeline.result(i, q, a)
+                    st.write(render_analysis(analysis))
+                else:
+                    # Finished analyses are written at once, running ones stream the rest of their tokens
+                    analysis = st.write_stream(pipeline.stream_result(i, q, a))
+                analyses.append(analysis)
 
-    # Generate and display overall analysis
-    with st.spinner("Generating overall analysis..."):
-        overall_analysis = analyzer.generate_overall_analysis(analyses)
-    
-    st.subheader("Overall Analysis:")
-    st.write(overall_analysis)
+        # Stream the overall analysis
+        st.subheader("Overall Analysis:")
+        analyzer = pipeline.analyzer
+        st.write_stream(analyzer.stream_in_background(analyzer.stream_overall_analysis(analyses), "overall analysis"))
+    export_metrics()
 
     if st.button("Start New Session"):
+        pipeline.cancel()
         for key in list(st.session_state.keys()):
             del st.session_state[key]
         st.rerun()
 
 if __name__ == "__main__":
     config = read_config("./config.yaml")  
-    download_ollama_model(config.llm.embed_model)
-    download_ollama_model(config.llm.model)
+    # The embedding model runs locally through HuggingFace; only the LLM is served by Ollama
+    download_ollama_model(config.llm.model, config.llm.base_url, config.llm.availability_timeout)
     main(config=config)